@@ -6,9 +6,21 @@ try:
 except PackageNotFoundError:
     __version__ = "unknown"
 
-from aiu_trace_analyzer.trace_view import AbstractEventType
-from aiu_trace_analyzer import *
-from aiu_trace_analyzer.ingest import *
-from aiu_trace_analyzer.export import *
-from aiu_trace_analyzer.core import *
-from aiu_trace_analyzer.pipeline import *
+from aiu_trace_analyzer.trace_view import AbstractEventType  # noqa: F401
+
+
+def __getattr__(name: str):
+    # pipeline names used to be star-imported here, which pulled in pandas and every stage on import.
+    # Resolve them on first access instead.
+    if not name.startswith("__"):
+        from importlib import import_module
+        try:
+            # submodules (pipeline, core, logger, ...) that nobody has imported yet
+            return import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+        pipeline = import_module(f"{__name__}.pipeline")
+        if hasattr(pipeline, name):
+            return getattr(pipeline, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
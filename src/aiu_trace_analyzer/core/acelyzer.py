@@ -342,7 +342,8 @@ class Acelyzer:
                             help="Name of a processing profile json that lists"
                             " the active processing stages to run")
 
-        parser.add_argument("-o", "--output", type=str, default=None, help="Output file name.")
+        parser.add_argument("-o", "--output", type=str, default=None,
+                            help="Output file name. A '.gz' suffix writes gzip-compressed json trace files.")
         parser.add_argument("-R", "--build_coll_event", dest="build_coll_event", action="store_true",
                             default=self.defaults["build_coll_event"],
                             help="Enable collective event detection/visualization."
@@ -675,7 +676,9 @@ class Acelyzer:
 
         monotonic_ts_ctx_c = event_pipe.TSSequenceContext()
         process.register_stage(callback=event_pipe.assert_global_ts_sequence, context=monotonic_ts_ctx_c)
-        categorizer_ctx = event_pipe.EventCategorizerContext(with_zero_align=(args.format == "timeline"))
+        categorizer_ctx = event_pipe.EventCategorizerContext(
+            with_zero_align=(args.format == "timeline"),
+            flex_check=(args.loglevel >= aiulog.DEBUG))
 
         launch_flows_ctx = event_pipe.LaunchFLowContext()
         process.register_stage(callback=event_pipe.launch_flow_collect, context=launch_flows_ctx)
@@ -1,5 +1,6 @@
 # Copyright 2024-2025 IBM Corporation
 
+from bisect import bisect_left
 from collections import Counter
 import json
 import os
@@ -14,6 +15,10 @@ class StageProfile:
 
     def __init__(self, profile_data: dict, all_stages: dict):
         self.profile = self._ingest_profile_data(profile_data, all_stages)
+        # positions of each stage name in the profile (recurring stages have multiple)
+        self.index: dict[str, list[int]] = {}
+        for idx, (stage, _) in enumerate(self.profile):
+            self.index.setdefault(stage, []).append(idx)
 
     @classmethod
     def from_json(cls, file: Path):
@@ -161,8 +166,10 @@ class StageProfileChecker:
         self.reg_idx = 0
 
     def fwd_find_stage(self, stage: str) -> bool:
-        for incr, st in enumerate(self.stages.profile[self.reg_idx:]):
-            if stage == st[0]:
-                self.reg_idx += incr + 1
-                return st[1]
-        return False
+        positions = self.stages.index.get(stage, [])
+        pos = bisect_left(positions, self.reg_idx)
+        if pos == len(positions):
+            return False
+        stage_idx = positions[pos]
+        self.reg_idx = stage_idx + 1
+        return self.stages.profile[stage_idx][1]
@@ -2,6 +2,7 @@
 
 import sys
 import os
+import gzip
 from collections import defaultdict
 from typing import Optional
 
@@ -36,15 +37,18 @@ class AbstractTraceExporter:
             self.meta["Settings"] = {"output": target_uri}
         else:
             self.meta["Settings"] = settings
-        self.device_data = []
+        self.device_data: list[dict] = []
         self.save_to_file = settings["save_to_file"] if settings is not None and "save_to_file" in settings else True
 
     def add_device(self, id, data: dict):
-        devdata = {"id": id}
-        for k, v in data.items():
-            devdata[k] = v
-        self.device_data.append(devdata)
-        assert isinstance(self.device_data, list)
+        self.device_data.append({"id": id, **data})
+
+    # open a trace output file, a '.gz' suffix streams the json through gzip
+    @staticmethod
+    def _open_trace_file(file_name: str):
+        if file_name.endswith(".gz"):
+            return gzip.open(file_name, 'wt', compresslevel=3)
+        return open(file_name, 'w')
 
     def export_meta(self, meta_data: dict) -> None:
         raise NotImplementedError("Class %s doesn't implement export()" % (self.__class__.__name__))
@@ -71,8 +75,9 @@ class JsonFileTraceExporter(AbstractTraceExporter):
 
     # take (a list) of events and append to the traceview
     def export(self, data: list[tv.AbstractEventType]):
-        for event in data:
-            self.traceview.append_trace_event(event.json())
+        # json() hands out the event's attribute dict without copying,
+        # no need for the per-event type check of append_trace_event()
+        self.traceview.trace_events.extend([event.json() for event in data])
 
     def export_meta(self, meta_data):
         self.traceview.add_metadata(meta_data)
@@ -87,10 +92,9 @@ class JsonFileTraceExporter(AbstractTraceExporter):
 
     # write the traceview to file
     def flush(self):
-        assert isinstance(self.device_data, list)
         self.traceview.add_device_data(self.device_data)
         if self.save_to_file:
-            with open(self.target_uri, 'w') as json_new_pids_file:
+            with self._open_trace_file(self.target_uri) as json_new_pids_file:
                 self.traceview.dump(fp=json_new_pids_file)
 
 
@@ -142,13 +146,11 @@ class TensorBoardFileTraceExporter(JsonFileTraceExporter):
     def _parse_by_rank_id(self, key, data) -> defaultdict[list]:
         events_by_id = defaultdict(list)
 
+        # single pass over the data; the grouping is a dict lookup + append per item
         for event in data:
             rank_id = event[key]
-            if rank_id is not None and isinstance(rank_id, int):
-                if rank_id >= 1000:
-                    rank_id -= 1000
-
-                events_by_id[rank_id].append(event)
+            if isinstance(rank_id, int):
+                events_by_id[rank_id - 1000 if rank_id >= 1000 else rank_id].append(event)
 
         return events_by_id
 
@@ -158,26 +160,32 @@ class TensorBoardFileTraceExporter(JsonFileTraceExporter):
             if rid not in self.traceview_by_rank:
                 self.traceview_by_rank[rid] = tv.TraceView(display_time_unit=self.timescale, other_data=self.meta)
 
-            traceview_by_rank = self.traceview_by_rank[rid]
-            if hasattr(traceview_by_rank, var_name):
-                if var_name == "display_time_unit" or var_name == "other_data":
-                    setattr(self.traceview_by_rank[rid], var_name, value)
-                else:
-                    setattr(self.traceview_by_rank[rid], var_name, value[rid])
-            else:
-                aiulog.log(aiulog.WARN,
-                           f"TB_EXPORTER:  no attribute '{var_name}'"
-                           " for traceview when preparing distributed view for TB")
+        # all per-rank traceviews are of the same type, check the attribute only once
+        if rank_cnt > 0 and not hasattr(self.traceview_by_rank[0], var_name):
+            aiulog.log(aiulog.WARN,
+                       f"TB_EXPORTER:  no attribute '{var_name}'"
+                       " for traceview when preparing distributed view for TB")
+            return
+
+        shared_value = var_name in ("display_time_unit", "other_data")
+        for rid in range(0, rank_cnt):
+            setattr(self.traceview_by_rank[rid], var_name, value if shared_value else value[rid])
+
+    @staticmethod
+    def _split_gz_suffix(file_name: str) -> tuple[str, str]:
+        if file_name.endswith(".gz"):
+            return file_name[:-len(".gz")], ".gz"
+        return file_name, ""
 
     def _save_overall_trace(self) -> None:
         # consider support for other file formats not end with .json
-        file_name = self.target_uri
+        file_name, gz_suffix = self._split_gz_suffix(self.target_uri)
         if file_name.endswith('.json') and not file_name.endswith(self.default_extension):
             file_name = file_name.replace('.json', self.default_extension)
 
         # NO DUMP TO FILE FOR TB. Export serialized json via get_data instead
         if self.save_to_file:
-            with open(file_name, 'w') as json_new_pids_file:
+            with self._open_trace_file(file_name + gz_suffix) as json_new_pids_file:
                 self.traceview.dump(fp=json_new_pids_file)
 
     def get_tb_data(self, worker) -> str:
@@ -186,22 +194,21 @@ class TensorBoardFileTraceExporter(JsonFileTraceExporter):
     # Save events to indivudal file by pid
     def _save_events_by_id(self) -> None:
         # consider support for other file formats not end with .json
-        file_name = self.target_uri
+        file_name, gz_suffix = self._split_gz_suffix(self.target_uri)
         if file_name.endswith(self.default_extension):
             fbase = file_name[:-len(self.default_extension)]
         else:
             fbase = os.path.splitext(file_name)[0]
 
         for rid in range(0, self.rank_cnt):
-            output_file = f'{fbase}_worker_{rid}.pt.trace.json'
-            with open(output_file, 'w') as f:
+            output_file = f'{fbase}_worker_{rid}.pt.trace.json{gz_suffix}'
+            with self._open_trace_file(output_file) as f:
                 self.traceview_by_rank[rid].dump(fp=f)
 
         self._save_overall_trace()
 
     # write the traceview to file
     def flush(self):
-        assert isinstance(self.device_data, list)
         self.traceview.add_device_data(self.device_data)
 
         self._parse_events_by_id()
@@ -219,7 +226,6 @@ class DataframeExporter(AbstractTraceExporter):
             self, target_uri, timescale="ms", settings=None,
             data_map: dict = None):
         super().__init__(target_uri=target_uri, settings=settings)
-        self.vertical_view = []
         self.df = None
 
         # mapping from event entry to dataframe column
@@ -239,17 +245,21 @@ class DataframeExporter(AbstractTraceExporter):
         else:
             self.data_map = data_map
 
+        # split the key paths once instead of per event and column
+        self._key_paths = {jpath: (tuple(jpath.split('.')), default) for jpath, (_, default) in self.data_map.items()}
+        # column-major buffer: one list of values per data_map entry
+        self.columns: list[list] = [[] for _ in self.data_map]
+
     def export_meta(self, meta_data: dict) -> None:
         # no metadata for this exporter type
         return
 
     def _extract_value(self, key_path: str, event: dict) -> str:
         try:
-            default = self.data_map[key_path][1]
+            keys, default = self._key_paths[key_path]
         except KeyError:
             return "N/A"
 
-        keys = key_path.split('.')
         value = event
         for k in keys:
             if isinstance(value, dict) and k in value:
@@ -262,11 +272,8 @@ class DataframeExporter(AbstractTraceExporter):
         if event_dict.ph != "X":
             return None
 
-        rval = []
-        for jpath in self.data_map.keys():
-            rval.append(self._extract_value(jpath, event_dict.json()))
-
-        return tuple(rval)
+        event_data = event_dict.json()
+        return tuple(self._extract_value(jpath, event_data) for jpath in self.data_map.keys())
 
     # export (a list) of events to the configured target
     def export(self, data: list[tv.AbstractEventType]):
@@ -276,11 +283,14 @@ class DataframeExporter(AbstractTraceExporter):
 
             event_line = self._convert_trace_event(event)
             if event_line:
-                self.vertical_view.append(event_line)
+                for column, value in zip(self.columns, event_line):
+                    column.append(value)
 
     def flush(self):
         title_row = [v[0] for v in self.data_map.values()]
-        self.df = pd.DataFrame(self.vertical_view, columns=title_row)
+        # build by position, titles of a custom data_map are not necessarily unique
+        self.df = pd.DataFrame(dict(enumerate(self.columns)))
+        self.df.columns = title_row
 
         if self.save_to_file:
             with open(self.target_uri, 'w') as f:
@@ -83,6 +83,11 @@ def setloglevel(ll: int):
     loglevel = ll
 
 
+# check before building expensive log arguments (e.g. f-strings) in hot paths
+def is_enabled(level: int) -> bool:
+    return level <= loglevel
+
+
 logcolor_codes = [
     ("\033[91m", "\033[0m"),   # red error
     ("\033[93m", "\033[0m"),   # yellow warning
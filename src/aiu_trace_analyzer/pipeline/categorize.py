@@ -1,9 +1,11 @@
 # Copyright 2024-2025 IBM Corporation
 
-from enum import Enum, auto
+import re
+from enum import IntEnum, auto
+from typing import Callable
 
 import aiu_trace_analyzer.logger as aiulog
-from aiu_trace_analyzer.types import TraceEvent, TraceWarning
+from aiu_trace_analyzer.types import TraceEvent, TraceWarning, InputDialect
 from aiu_trace_analyzer.pipeline.context import AbstractContext
 from aiu_trace_analyzer.pipeline.tools import PipelineContextTool as pct
 from aiu_trace_analyzer.pipeline.barrier import TwoPhaseWithBarrierContext
@@ -11,7 +13,7 @@ from aiu_trace_analyzer.pipeline.barrier import TwoPhaseWithBarrierContext
 
 #################################################
 # source from Josh
-class EventClass(Enum):
+class EventClass(IntEnum):
     """Enumeration of event classification categories for trace analysis.
 
     This enum defines various event types used to categorize trace events
@@ -57,14 +59,19 @@ class EventClass(Enum):
     # General Ack Signal
     MAIU_PROTOCOL_SIGNAL_ACK = auto()
 
+    # _name_ is the plain member attribute behind the 'name' property, skip the descriptor
     def __str__(self):
-        return self.name
+        return self._name_
+
+    # IntEnum would format as the int value, keep formatting by name
+    def __format__(self, format_spec):
+        return format(self._name_, format_spec)
 
     def __repr__(self):
-        return f"EventClass.{self.name}"
+        return f"EventClass.{self._name_}"
 
     def toJson(self):
-        return self.name
+        return self._name_
 
     @classmethod
     def from_string(cls, name: str) -> 'EventClass':
@@ -87,10 +94,77 @@ class EventClass(Enum):
 ########################################
 
 
+# event class names as stored in event args, avoids the str()/name lookup per event
+_CLASS_NAMES: dict[EventClass, str] = {ec: ec.name for ec in EventClass}
+
+
+class _CommNameMatcher:
+    """Single-pass matcher for the name fragments that refine collective events.
+
+    Each token groups name fragments that lead to the same classification decision. All fragments
+    are compiled into one regex alternation (longest first, inside a lookahead so that overlapping
+    fragments are reported too). A matched fragment sets the bit of every token with a fragment
+    contained in the matched text, so the mask equals the OR of the individual substring tests.
+    Traces repeat a small set of names many times, so masks are memoized per name.
+    """
+    _CACHE_LIMIT = 1 << 16
+
+    def __init__(self, token_fragments: dict[str, tuple[str, ...]]) -> None:
+        self._fragment_mask: dict[str, int] = {}
+        for bit, (token, fragments) in enumerate(token_fragments.items()):
+            setattr(self, token, 1 << bit)
+            for fragment in fragments:
+                self._fragment_mask.setdefault(fragment, 0)
+
+        for fragment in self._fragment_mask:
+            for token, fragments in token_fragments.items():
+                if any(f in fragment for f in fragments):
+                    self._fragment_mask[fragment] |= getattr(self, token)
+
+        alternation = "|".join(re.escape(f) for f in sorted(self._fragment_mask, key=len, reverse=True))
+        self._scanner = re.compile(f"(?=({alternation}))")
+        self._cache: dict[str, int] = {}
+
+    def match(self, name: str) -> int:
+        tokens = self._cache.get(name)
+        if tokens is None:
+            tokens = 0
+            for m in self._scanner.finditer(name):
+                tokens |= self._fragment_mask[m.group(1)]
+            if len(self._cache) < self._CACHE_LIMIT:
+                self._cache[name] = tokens
+        return tokens
+
+
+_COMM_NAMES = _CommNameMatcher({
+    "HOST_DMA": ("Host DMA", "HCOLL"),
+    "DLM_WAIT": ("DLM Wait",),
+    "WAIT_DATA": ("Wdone DmaI",
+                  "Wait for Data Avail Notice",
+                  "Wait for Notice (gather notifications)",
+                  "R5 Wait DATA"),
+    "WAIT_ACK": ("Wait for ACK", "R5 Wait ACK"),
+    "SIGNAL_ACK": ("Send ACK Instruction", "R5 Send ACK"),
+    "SIGNAL_DATA": ("Send Instruction", "HCOLL Signal", "R5 Send DATA"),
+    "MONITOR_NOTICE": ("Wait for Notice", "Wait for Delivery Notice"),
+    "SERIAL": ("Set BcList", "Xseg to rank"),
+})
+
+# Host DMA protocol refinements in order of precedence
+_HOST_DMA_RULES = (
+    (_COMM_NAMES.WAIT_DATA, EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA),
+    (_COMM_NAMES.WAIT_ACK, EventClass.MAIU_HDMA_PROTOCOL_WAIT_ACK),
+    (_COMM_NAMES.SIGNAL_ACK, EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_ACK),
+    (_COMM_NAMES.SIGNAL_DATA, EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_DATA),
+    (_COMM_NAMES.MONITOR_NOTICE, EventClass.MAIU_HDMA_PROTOCOL_MONITOR_NOTICE),
+)
+
+
 class EventCategorizerContext(TwoPhaseWithBarrierContext):
     _BYTES_ENTRY = "bytes"
+    _CLASS_CACHE_LIMIT = 1 << 16
 
-    def __init__(self, with_zero_align: bool = False):
+    def __init__(self, with_zero_align: bool = False, flex_check: bool = False):
         super().__init__(warnings=[
             TraceWarning(
                 name="flex_mismatch",
@@ -98,7 +172,14 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
                 data={"count": 0}
             )])
         self.do_zero_align = 1.0 if with_zero_align else 0.0
+        # cross-checking against the FLEX reference classifier doubles the classification work
+        self.flex_check = flex_check
         self.first_ts_per_rank: dict[int, float] = {}
+        # compiled category rules per input dialect (see classify_event)
+        self._dialect_rules: dict[InputDialect, tuple[tuple, tuple]] = {}
+        # classify_event results by (dialect, name, cat, is_collective), see get_event_class
+        self._class_cache: dict[tuple, EventClass] = {}
+        self._cache_collective_check: dict[InputDialect, Callable[[TraceEvent], bool] | None] = {}
 
     def is_collective_event(self, event: TraceEvent) -> bool:
         """Determine if an event is a collective communication event.
@@ -114,7 +195,8 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
     def classify_flex(self, event: TraceEvent) -> (EventClass | None):   # noqa: C901
         """Classify trace events using FLEX dialect-based classification.
 
-        This method is currently kept for verification of the dialect-based classifier.
+        This method is currently kept for verification of the dialect-based classifier
+        and only runs if the context was created with flex_check enabled.
         It categorizes events based on FLEX-specific naming patterns and collective
         communication protocols.
 
@@ -132,52 +214,53 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
         dialect = pct.get_dialect_of_event(event)
         if dialect is None or dialect.get("NAME") != "FLEX":
             return None
+        name = event["name"]
         event_class = EventClass.OTHER
-        if "Cmpt Prep" in event["name"]:
+        if "Cmpt Prep" in name:
             # TS1 TS2 --- --- ---
             event_class = EventClass.COMPUTE_PREP
-        elif "Cmpt Exec" in event["name"]:
+        elif "Cmpt Exec" in name:
             # --- --- TS3 TS4 TS5
             event_class = EventClass.COMPUTE_EXEC
-        elif "DmaI" in event["name"]:
-            if "Cleanup Host DMA Wait for ACK" in event["name"]:
+        elif "DmaI" in name:
+            if "Cleanup Host DMA Wait for ACK" in name:
                 event_class = EventClass.MAIU_HDMA_PROTOCOL_WAIT_ACK
             else:
                 event_class = EventClass.DATA_IN
-        elif "DmaO" in event["name"]:
+        elif "DmaO" in name:
             event_class = EventClass.DATA_OUT
 
-        if "Compute of" in event["name"] and "SenFusedDeviceNode" not in event["name"]:
+        if "Compute of" in name and "SenFusedDeviceNode" not in name:
             event_class = EventClass.SEN_DATA_CONVERT
-        if "PrepareAndSyncRdma" in event["name"]:
+        if "PrepareAndSyncRdma" in name:
             event_class = EventClass.MAIU_WIREUP
-        if "Barrier:" in event["name"]:
+        if "Barrier:" in name:
             event_class = EventClass.MAIU_BARRIER
-        if "Flex RoundTrip" in event["name"]:
+        if "Flex RoundTrip" in name:
             event_class = EventClass.ROUNDTRIP_FLEX
-        if "AIU Roundtrip" in event["name"]:
+        if "AIU Roundtrip" in name:
             event_class = EventClass.ROUNDTRIP_AIU
 
         if self.is_collective_event(event):
-            if "Host DMA" in event["name"] or "HCOLL" in event["name"]:
+            if "Host DMA" in name or "HCOLL" in name:
                 # PF mode
                 if (
-                    "Wdone DmaI" in event["name"] or
-                    "Wait for Data Avail Notice" in event["name"] or
-                    "Wait for Notice (gather notifications)" in event["name"] or
-                    "R5 Wait DATA" in event["name"]
+                    "Wdone DmaI" in name or
+                    "Wait for Data Avail Notice" in name or
+                    "Wait for Notice (gather notifications)" in name or
+                    "R5 Wait DATA" in name
                    ):
                     event_class = EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA
-                elif "Wait for ACK" in event["name"] or "R5 Wait ACK" in event["name"]:
+                elif "Wait for ACK" in name or "R5 Wait ACK" in name:
                     event_class = EventClass.MAIU_HDMA_PROTOCOL_WAIT_ACK
-                elif "Send ACK Instruction" in event["name"] or "R5 Send ACK" in event["name"]:
+                elif "Send ACK Instruction" in name or "R5 Send ACK" in name:
                     event_class = EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_ACK
                 elif (
-                      "Send Instruction" in event["name"] or
-                      "HCOLL Signal" in event["name"] or
-                      "R5 Send DATA" in event["name"]):
+                      "Send Instruction" in name or
+                      "HCOLL Signal" in name or
+                      "R5 Send DATA" in name):
                     event_class = EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_DATA
-                elif "Wait for Notice" in event["name"] or "Wait for Delivery Notice" in event["name"]:
+                elif "Wait for Notice" in name or "Wait for Delivery Notice" in name:
                     event_class = EventClass.MAIU_HDMA_PROTOCOL_MONITOR_NOTICE
                 elif EventClass.DATA_OUT == event_class:
                     event_class = EventClass.MAIU_HDMA_PROTOCOL_SEND_DATA
@@ -185,10 +268,10 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
                     event_class = EventClass.MAIU_HDMA_PROTOCOL_RECV_DATA
             # DLM Wait might not have the 'Host DMA' prefix
             # Assume it is waiting on data
-            elif "DLM Wait" in event["name"]:
+            elif "DLM Wait" in name:
                 event_class = EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA
             else:
-                if "Set BcList" in event["name"] or "Xseg to rank" in event["name"]:
+                if "Set BcList" in name or "Xseg to rank" in name:
                     event_class = EventClass.MAIU_PROTOCOL_SERIAL
                 elif EventClass.DATA_OUT == event_class:
                     event_class = EventClass.MAIU_P2PRDMA_PROTOCOL_SEND_DATA
@@ -196,6 +279,33 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
                     event_class = EventClass.MAIU_P2PRDMA_PROTOCOL_RECV_DATA
         return event_class
 
+    # dialect categories of classify_event(): the first primary match sets the class
+    _PRIMARY_CATEGORIES = (
+        ("acc_compute_prep", EventClass.COMPUTE_PREP),
+        ("acc_kernel", EventClass.COMPUTE_EXEC),
+        # todo: further sub-cat for DMA WAIT FOR ACK
+        ("acc_datatransfer_HtoD", EventClass.DATA_IN),
+        ("acc_datatransfer_DtoH", EventClass.DATA_OUT),
+    )
+    # every matching override replaces the class, the last match wins
+    _OVERRIDE_CATEGORIES = (
+        ("acc_data_convert", EventClass.SEN_DATA_CONVERT),
+        ("acc_rdma_prep_sync", EventClass.MAIU_WIREUP),
+        ("acc_barrier", EventClass.MAIU_BARRIER),
+        ("acc_supernode_exec", EventClass.ROUNDTRIP_FLEX),
+        ("acc_supernode_launch", EventClass.ROUNDTRIP_FLEX),
+    )
+
+    def _get_dialect_rules(self, dialect: InputDialect) -> tuple[tuple, tuple]:
+        rules = self._dialect_rules.get(dialect)
+        if rules is None:
+            rules = tuple(
+                tuple((pct.get_category_classifier(dialect, category), category_class)
+                      for category, category_class in categories)
+                for categories in (self._PRIMARY_CATEGORIES, self._OVERRIDE_CATEGORIES))
+            self._dialect_rules[dialect] = rules
+        return rules
+
     def classify_event(self, event: TraceEvent) -> EventClass:
         """Classify trace events using dialect-based category classification.
 
@@ -211,75 +321,53 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
                        and communication-specific classification rules
         """
         event_class = EventClass.OTHER
-        if pct.is_category(event, "acc_compute_prep"):
-            event_class = EventClass.COMPUTE_PREP
-        elif pct.is_category(event, "acc_kernel"):
-            event_class = EventClass.COMPUTE_EXEC
-        elif pct.is_category(event, "acc_datatransfer_HtoD"):
-            # todo: further sub-cat for DMA WAIT FOR ACK
-            event_class = EventClass.DATA_IN
-        elif pct.is_category(event, "acc_datatransfer_DtoH"):
-            event_class = EventClass.DATA_OUT
+        dialect = pct.get_dialect_of_event(event)
+        if dialect is not None:
+            primary_rules, override_rules = self._get_dialect_rules(dialect)
+            for is_category, category_class in primary_rules:
+                if is_category(event):
+                    event_class = category_class
+                    break
+            for is_category, category_class in override_rules:
+                if is_category(event):
+                    event_class = category_class
 
-        if pct.is_category(event, "acc_data_convert"):
-            event_class = EventClass.SEN_DATA_CONVERT
-        if pct.is_category(event, "acc_rdma_prep_sync"):
-            event_class = EventClass.MAIU_WIREUP
-        if pct.is_category(event, "acc_barrier"):
-            event_class = EventClass.MAIU_BARRIER
-        if pct.is_category(event, "acc_supernode_exec") or \
-                pct.is_category(event, "acc_supernode_launch"):
-            event_class = EventClass.ROUNDTRIP_FLEX
         # this has only a meaning in FLEX traces
         if "AIU Roundtrip" in event["name"]:
             event_class = EventClass.ROUNDTRIP_AIU
 
         return self.classify_comm(event, event_class)
 
-    def _classify_host_dma_event(self, event: TraceEvent, event_class: EventClass) -> EventClass:
+    def _classify_host_dma_event(self, tokens: int, event_class: EventClass) -> EventClass:
         """Classify Host DMA protocol events.
 
         Args:
-            event: The trace event to classify
+            tokens: The comm name token mask of the event (see _CommNameMatcher)
             event_class: The current event classification
 
         Returns:
             EventClass: The refined event classification for Host DMA operations
         """
-        if (
-            "Wdone DmaI" in event["name"] or
-            "Wait for Data Avail Notice" in event["name"] or
-            "Wait for Notice (gather notifications)" in event["name"] or
-            "R5 Wait DATA" in event["name"]
-           ):
-            return EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA
-        elif "Wait for ACK" in event["name"] or "R5 Wait ACK" in event["name"]:
-            return EventClass.MAIU_HDMA_PROTOCOL_WAIT_ACK
-        elif "Send ACK Instruction" in event["name"] or "R5 Send ACK" in event["name"]:
-            return EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_ACK
-        elif ("Send Instruction" in event["name"] or
-              "HCOLL Signal" in event["name"] or
-              "R5 Send DATA" in event["name"]):
-            return EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_DATA
-        elif "Wait for Notice" in event["name"] or "Wait for Delivery Notice" in event["name"]:
-            return EventClass.MAIU_HDMA_PROTOCOL_MONITOR_NOTICE
-        elif EventClass.DATA_OUT == event_class:
+        for token, token_class in _HOST_DMA_RULES:
+            if tokens & token:
+                return token_class
+        if EventClass.DATA_OUT == event_class:
             return EventClass.MAIU_HDMA_PROTOCOL_SEND_DATA
         elif EventClass.DATA_IN == event_class:
             return EventClass.MAIU_HDMA_PROTOCOL_RECV_DATA
         return event_class
 
-    def _classify_p2p_rdma_event(self, event: TraceEvent, event_class: EventClass) -> EventClass:
+    def _classify_p2p_rdma_event(self, tokens: int, event_class: EventClass) -> EventClass:
         """Classify P2P RDMA protocol events.
 
         Args:
-            event: The trace event to classify
+            tokens: The comm name token mask of the event (see _CommNameMatcher)
             event_class: The current event classification
 
         Returns:
             EventClass: The refined event classification for P2P RDMA operations
         """
-        if "Set BcList" in event["name"] or "Xseg to rank" in event["name"]:
+        if tokens & _COMM_NAMES.SERIAL:
             return EventClass.MAIU_PROTOCOL_SERIAL
         elif EventClass.DATA_OUT == event_class:
             return EventClass.MAIU_P2PRDMA_PROTOCOL_SEND_DATA
@@ -304,15 +392,16 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
         if not pct.is_category(event, "acc_collective"):
             return event_class
 
-        if "Host DMA" in event["name"] or "HCOLL" in event["name"]:
+        tokens = _COMM_NAMES.match(event["name"])
+        if tokens & _COMM_NAMES.HOST_DMA:
             # PF mode
-            return self._classify_host_dma_event(event, event_class)
+            return self._classify_host_dma_event(tokens, event_class)
         # DLM Wait might not have the 'Host DMA' prefix
         # Assume it is waiting on data
-        elif "DLM Wait" in event["name"]:
+        elif tokens & _COMM_NAMES.DLM_WAIT:
             return EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA
         else:
-            return self._classify_p2p_rdma_event(event, event_class)
+            return self._classify_p2p_rdma_event(tokens, event_class)
 
     def get_event_class(self, event: TraceEvent) -> EventClass:
         """Get the event classification for a trace event.
@@ -325,15 +414,44 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
 
         Note:
             Returns EventClass.OTHER if the event lacks a 'name' field.
-            Temporary: checks FLEX traces against reference impl.
         """
         if "name" not in event:
             return EventClass.OTHER
 
-        event_class = self.classify_event(event)
-
+        dialect = pct.get_dialect_of_event(event)
+        is_collective = self._get_cache_collective_check(dialect) if dialect is not None else None
+        if is_collective is None:
+            return self.classify_event(event)
+
+        # traces repeat few distinct names many times, classify each combination only once
+        key = (dialect, event["name"], event.get("cat"), is_collective(event))
+        event_class = self._class_cache.get(key)
+        if event_class is None:
+            event_class = self.classify_event(event)
+            if len(self._class_cache) < self._CLASS_CACHE_LIMIT:
+                self._class_cache[key] = event_class
         return event_class
 
+    def _get_cache_collective_check(self, dialect: InputDialect) -> Callable[[TraceEvent], bool] | None:
+        # returns the collective check that completes the class cache key, None if the dialect can't be cached
+        if dialect not in self._cache_collective_check:
+            self._cache_collective_check[dialect] = (
+                pct.get_category_classifier(dialect, "acc_collective")
+                if self._classified_by_name_and_cat(dialect) else None)
+        return self._cache_collective_check[dialect]
+
+    @classmethod
+    def _classified_by_name_and_cat(cls, dialect: InputDialect) -> bool:
+        # classify_event results can be cached if its categories only look at the event name or cat
+        for category, _ in cls._PRIMARY_CATEGORIES + cls._OVERRIDE_CATEGORIES:
+            entry = dialect.get(category)
+            if entry is None:
+                return False
+            classifier = entry.split(';')[0].split('.')
+            if len(classifier) > 1 and classifier[1:] not in (["name"], ["cat"]):
+                return False
+        return True
+
     def _protocol_or_data_send(self, event: TraceEvent) -> EventClass:
         if self._BYTES_ENTRY in event["args"] and event["args"][self._BYTES_ENTRY] == 128:
             return EventClass.MAIU_PROTOCOL_SIGNAL_DATA
@@ -346,28 +464,37 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
         else:
             return EventClass.MAIU_PROTOCOL_RECV_DATA
 
+    # only plain transfers can be refined by the second pass
+    _refinable_classes = frozenset([
+        _CLASS_NAMES[EventClass.DATA_IN],
+        _CLASS_NAMES[EventClass.DATA_OUT],
+    ])
+
     def second_pass_classify(self, event: TraceEvent) -> str:
         '''
         Determination of some event classes require batch/time context
         this info has
         '''
+        event_class = event["args"]["class"]
+        # skip the dialect and batch lookups for the majority of events that can't change class
+        if event_class not in self._refinable_classes:
+            return event_class
+
         dialect = pct.get_dialect_of_event(event)
         if dialect is None or dialect.get("NAME") != "FLEX" or \
                 not pct.is_acc_event(event):
-            return event["args"]["class"]
+            return event_class
 
         batch_id = pct.get_context_id(event)
         if batch_id not in self.queues:
-            return event["args"]["class"]
+            return event_class
 
-        event_class = EventClass.from_string(event["args"]["class"])
         first_comp, last_comp = self.queues[batch_id]
         if event["ts"] > first_comp and event["ts"] < last_comp:
-            if event_class == EventClass.DATA_OUT:
-                return str(self._protocol_or_data_send(event))
-            if event_class == EventClass.DATA_IN:
-                return str(self._protocol_or_data_recv(event))
-        return str(event_class)
+            if event_class == _CLASS_NAMES[EventClass.DATA_OUT]:
+                return _CLASS_NAMES[self._protocol_or_data_send(event)]
+            return _CLASS_NAMES[self._protocol_or_data_recv(event)]
+        return event_class
 
     def collect_stats(self, event: TraceEvent) -> None:
         """Collect statistics from trace events during the first pass.
@@ -385,24 +512,24 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
         """
         assert "args" in event, "BUG: Classifier (first pass) detected X-event without 'args'" \
             " which should have been added by ingestion or previous stages."
+        ts = event["ts"]
         rank = event["args"].get("rank", 0)
-        if rank not in self.first_ts_per_rank:
-            self.first_ts_per_rank[rank] = event["ts"]
-        else:
-            self.first_ts_per_rank[rank] = min(self.first_ts_per_rank[rank], event["ts"])
+        # plain compares, most events don't move the minimum
+        first_ts = self.first_ts_per_rank.get(rank)
+        if first_ts is None or ts < first_ts:
+            self.first_ts_per_rank[rank] = ts
         if pct.is_acc_kernel(event):
             batch_id = pct.get_context_id(event)
-            if batch_id not in self.queues:
-                self.queues[batch_id] = (1.e99, -1.e99)
-            tmin, tmax = self.queues[batch_id]
-            self.queues[batch_id] = (min(tmin, event["ts"]),
-                                     max(tmax, event["ts"]))
+            tmin, tmax = self.queues.get(batch_id, (1.e99, -1.e99))
+            if ts < tmin or ts > tmax:
+                self.queues[batch_id] = (min(tmin, ts), max(tmax, ts))
 
     def apply_stats(self, event: TraceEvent) -> TraceEvent:
         """Apply collected statistics to trace events during the second pass.
 
         Normalizes event timestamps based on the earliest timestamp per rank (if zero
         alignment is enabled) and updates event classification in the args.
+        With flex_check enabled, the first-pass class is compared against the FLEX reference classifier.
 
         Args:
             event: The trace event to apply statistics to
@@ -424,25 +551,34 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
                 aiulog.ERROR,
                 f"CAT: ACELYZER-BUG: Event ts smaller than min of collected event ts for rank {rank}.")
 
+        # the FLEX reference classifier has no batch context, compare it against the first-pass class
+        event_class = event["args"].get("class")
         refined_class = self.second_pass_classify(event)
         if "class" in event["args"]:
             event["args"]["class"] = refined_class
 
+        if self.flex_check:
+            self._check_flex_classification(event, event_class)
+
+        return event
+
+    def _check_flex_classification(self, event: TraceEvent, event_class: str) -> None:
         fevent_class = self.classify_flex(event)
-        if fevent_class is not None:
+        if fevent_class is not None and fevent_class.name != event_class:
             self.warnings["flex_mismatch"].update()
             aiulog.log(
                 aiulog.DEBUG, "Flex and generic classificaton diff: "
-                f"{fevent_class.name} != {refined_class} in {event}")
+                f"{fevent_class.name} != {event_class} in {event}")
 
-        return event
+    _transfer_classes = frozenset([
+        _CLASS_NAMES[EventClass.DATA_IN],
+        _CLASS_NAMES[EventClass.DATA_OUT],
+        _CLASS_NAMES[EventClass.MAIU_PROTOCOL_RECV_DATA],
+        _CLASS_NAMES[EventClass.MAIU_PROTOCOL_SEND_DATA],
+    ])
 
-    _transfer_classes = [
-        str(EventClass.DATA_IN),
-        str(EventClass.DATA_OUT),
-        str(EventClass.MAIU_PROTOCOL_RECV_DATA),
-        str(EventClass.MAIU_PROTOCOL_SEND_DATA),
-    ]
+    # key order of the bandwidth counters as written to the output, ts/pid/args are set per event
+    _BW_COUNTER = TraceEvent({"ph": "C", "ts": 0.0, "pid": 0, "name": "TransferBW", "args": None})
 
     def enhanced_events(self, event: TraceEvent) -> list[TraceEvent]:
         """Generate enhanced events with additional bandwidth counter events.
@@ -465,27 +601,14 @@ class EventCategorizerContext(TwoPhaseWithBarrierContext):
             return [event]
 
         if event["args"]["class"] in self._transfer_classes:
-            try:
-                bw = event["args"]["memory bandwidth (GB/s)"]
-            except KeyError:
-                bw = 0.0
+            bw = event["args"].get("memory bandwidth (GB/s)", 0.0)
 
             if bw > 0.0:
-                bw_counters = [TraceEvent({
-                        "ph": "C",
-                        "ts": event["ts"],
-                        "pid": event["pid"],
-                        "name": "TransferBW",
-                        "args": {"GB/s": bw},
-                    }),
-                    TraceEvent({
-                        "ph": "C",
-                        "ts": event["ts"]+event["dur"],
-                        "pid": event["pid"],
-                        "name": "TransferBW",
-                        "args": {"GB/s": 0.0}
-                    })]
-                return [event] + bw_counters
+                return [
+                    event,
+                    TraceEvent(self._BW_COUNTER, ts=event["ts"], pid=event["pid"], args={"GB/s": bw}),
+                    TraceEvent(self._BW_COUNTER, ts=event["ts"]+event["dur"], pid=event["pid"], args={"GB/s": 0.0}),
+                ]
         return [event]
 
 
@@ -511,7 +634,7 @@ def event_categorizer(event: TraceEvent, context: AbstractContext) -> list[Trace
     assert isinstance(context, EventCategorizerContext)
 
     context.collect_stats(event)
-    event["args"]["class"] = str(context.get_event_class(event))
+    event["args"]["class"] = _CLASS_NAMES[context.get_event_class(event)]
 
     return [event]
 
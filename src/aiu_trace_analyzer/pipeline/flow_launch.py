@@ -1,14 +1,11 @@
 # Copyright 2024-2025 IBM Corporation
 
-import re
-
 import aiu_trace_analyzer.logger as aiulog
 from aiu_trace_analyzer.types import TraceEvent, TraceWarning
 from aiu_trace_analyzer.pipeline import AbstractContext, TwoPhaseWithBarrierContext
 
 
 class LaunchFLowContext(TwoPhaseWithBarrierContext):
-    launch_pattern = re.compile(r'Launch.*ControlBlock')
 
     def __init__(self, warnings=None):
         if warnings is None:
@@ -29,67 +26,75 @@ class LaunchFLowContext(TwoPhaseWithBarrierContext):
         super().__init__(warnings)
         self.flow_id_seq = 0
 
+    def _get_or_create_queue(self, qid: int, event: TraceEvent) -> dict:
+        # only build the initial queue entry when the id is new
+        queue = self.queues.get(qid)
+        if queue is None:
+            queue = {"last_ts": event["ts"], "last_pid_tid": (event["pid"], event["tid"])}
+            self.queues[qid] = queue
+        return queue
+
     def collect_launchflow_ids(self, event: TraceEvent) -> None:
         if event["ph"] == "s":
-            qid = self.get_or_create(
-                event["id"],
-                {"last_ts": event["ts"], "last_pid_tid": (event["pid"], event["tid"])})
-            self.queues[qid]["src"] = event
+            self._get_or_create_queue(event["id"], event)["src"] = event
             return
 
         if event["ph"] != "X" or "args" not in event or "correlation" not in event["args"]:
             return
 
-        if self.launch_pattern.search(event["name"]):
-            qid = self.get_or_create(
-                event["args"]["correlation"],
-                {"last_ts": event["ts"], "last_pid_tid": (event["pid"], event["tid"])})
+        qid = event["args"]["correlation"]
+        name = event["name"]
+        if self.is_launch_event(name):
+            queue = self._get_or_create_queue(qid, event)
             if qid == 0:
                 return
             self.max_flow_id_detection(qid)
-            self.queues[qid]["launch"] = event
+            queue["launch"] = event
 
-        elif "ScheduleWait" in event["name"]:
-            qid = self.get_or_create(
-                event["args"]["correlation"],
-                {"last_ts": event["ts"], "last_pid_tid": (event["pid"], event["tid"])})
+        elif "ScheduleWait" in name:
+            queue = self._get_or_create_queue(qid, event)
             if qid == 0:
                 return
             self.max_flow_id_detection(qid)
-            self.queues[qid]["schedwait"] = event
+            queue["schedwait"] = event
 
         else:
             # avoid creating entries for id=0 or non-kernel events
-            qid = event["args"]["correlation"]
             if qid == 0 or event["cat"] != "kernel":
                 return
 
-            qid = self.get_or_create(
-                qid,
-                {"last_ts": event["ts"], "last_pid_tid": (event["pid"], event["tid"])})
+            self._get_or_create_queue(qid, event)
             self.max_flow_id_detection(qid)
 
             self.update_last_ts(qid, event)
 
+    @staticmethod
+    def is_launch_event(name: str) -> bool:
+        # same as matching r'Launch.*ControlBlock', but two substring searches instead of the regex engine
+        launch_idx = name.find("Launch")
+        return launch_idx != -1 and name.find("ControlBlock", launch_idx + len("Launch")) != -1
+
     def update_last_ts(self, qid: int, event: TraceEvent) -> None:
+        queue = self.queues[qid]
         last_ts = event["ts"] + event["dur"] - 0.001
-        if "schedwait" in self.queues[qid]:
-            sched_wait_end = self.queues[qid]["schedwait"]["ts"] + self.queues[qid]["schedwait"]["dur"]
+        schedwait = queue.get("schedwait")
+        if schedwait is not None:
+            sched_wait_end = schedwait["ts"] + schedwait["dur"]
         else:
             sched_wait_end = last_ts
-        if last_ts <= sched_wait_end and last_ts > self.queues[qid]["last_ts"]:
-            self.queues[qid]["last_ts"] = last_ts
-            self.queues[qid]["last_pid_tid"] = (event["pid"], event["tid"])
-            self.queues[qid]["last_event"] = event
+        if last_ts <= sched_wait_end and last_ts > queue["last_ts"]:
+            queue["last_ts"] = last_ts
+            queue["last_pid_tid"] = (event["pid"], event["tid"])
+            queue["last_event"] = event
         else:
             aiulog.log(aiulog.TRACE, "FLOWS: Ignoring event with ts after schedule wait", event)
             self.warnings["ts_after_schedwait"].update({"count": 1})
 
         # Check for timestamp inconsistency and mark queue as invalid if detected
-        if self.queues[qid]["last_ts"] > sched_wait_end:
+        if queue["last_ts"] > sched_wait_end:
             self.warnings["ts_inconsistency"].update({"count": 1})
             # Mark this queue as invalid to prevent flow event creation
-            self.queues[qid]["invalid"] = True
+            queue["invalid"] = True
 
     def max_flow_id_detection(self, observed_id: int) -> None:
         self.flow_id_seq = max(self.flow_id_seq, observed_id)
@@ -119,15 +124,15 @@ class LaunchFLowContext(TwoPhaseWithBarrierContext):
         if not self.has_required_data(event):
             return []
 
-        qid = event["args"]["correlation"]
-        if qid not in self.queues or "src" not in self.queues[qid]:
+        queue = self.queues.get(event["args"]["correlation"])
+        if queue is None or "src" not in queue:
             return []
 
         # Skip flow creation if queue is marked as invalid due to timestamp issues
-        if self.queues[qid].get("invalid", False):
+        if queue.get("invalid", False):
             return []
 
-        launcher = self.queues[qid]["src"]
+        launcher = queue["src"]
         new_flow_id = self.get_new_flow_id()
         flow_events = [
             {
@@ -143,8 +148,8 @@ class LaunchFLowContext(TwoPhaseWithBarrierContext):
                 "ph": "f",
                 "pid": event["pid"],
                 "tid": event["tid"],
-                "name": self.queues[qid]["src"]["name"],
-                "cat": self.queues[qid]["src"]["cat"],
+                "name": launcher["name"],
+                "cat": launcher["cat"],
                 "ts": event["ts"],
                 "id": new_flow_id,
                 "bp": "e"
@@ -166,30 +171,30 @@ class LaunchFLowContext(TwoPhaseWithBarrierContext):
                 continue
             launcher = qdata["src"]
             waiter = qdata["schedwait"]
+            pid, tid = qdata["last_pid_tid"]
+            name, cat = launcher["name"], launcher["cat"]
             new_flow_id = self.get_new_flow_id()
-            return_flows.append(
+            return_flows.extend((
                 {
                     "ph": "s",
-                    "pid": qdata["last_pid_tid"][0],
-                    "tid": qdata["last_pid_tid"][1],
-                    "name": launcher["name"],
-                    "cat": launcher["cat"],
+                    "pid": pid,
+                    "tid": tid,
+                    "name": name,
+                    "cat": cat,
                     "ts": qdata["last_ts"],
                     "id": new_flow_id
-                }
-            )
-            return_flows.append(
+                },
                 {
                     "ph": "f",
                     "pid": waiter["pid"],
                     "tid": waiter["tid"],
-                    "name": launcher["name"],
-                    "cat": launcher["cat"],
+                    "name": name,
+                    "cat": cat,
                     "ts": waiter["ts"] + waiter["dur"],
                     "id": new_flow_id,
                     "bp": "e"
                 }
-            )
+            ))
         return return_flows
 
 
@@ -204,5 +209,9 @@ def launch_flow_create_missing(event: TraceEvent, ctx: AbstractContext) -> list[
     assert isinstance(ctx, LaunchFLowContext)
 
     added_flows = ctx.create_missing(event)
+    if not added_flows:
+        return [event]
 
-    return [event] + added_flows
+    # create_missing returns a fresh list, prepend instead of concatenating
+    added_flows.insert(0, event)
+    return added_flows
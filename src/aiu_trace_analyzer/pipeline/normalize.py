@@ -11,19 +11,30 @@ from aiu_trace_analyzer.pipeline.context import AbstractContext
 from aiu_trace_analyzer.pipeline.hashqueue import AbstractHashQueueContext
 from aiu_trace_analyzer.pipeline.tools import FlexEventMapToTS
 
+_TS_KEYS = ("TS1", "TS2", "TS3", "TS4", "TS5")
+_HEX_KEYS = _TS_KEYS + ("Power",)
+# inline flags like (?i) or (?i:...) in user filter patterns
+_INLINE_FLAGS = re.compile(r"\(\?[aiLmsux-]")
+
 
 class EventStats(object):
+    __slots__ = ("cycle_start", "cycle_end", "ts", "dur", "freq_sum", "freq_min", "freq_max", "count")
+
     def __init__(self,
                  cycles: tuple[int, int] = (0, 0),
                  ts_dur: tuple[float, float] = (0.0, 0.0)):
         self.cycle_start, self.cycle_end = cycles
         self.ts, self.dur = ts_dur
 
-        self.freq_mean = 0.0
+        self.freq_sum = 0.0
         self.freq_min = 1.0e99
         self.freq_max = 0.0
         self.count = 0
 
+    @property
+    def freq_mean(self) -> float:
+        return self.freq_sum / self.count if self.count else 0.0
+
     def get_end_ts(self) -> float:
         return self.ts + self.dur
 
@@ -43,10 +54,12 @@ class EventStats(object):
         self.cycle_start, self.cycle_end = cycles
         self.ts, self.dur = ts_dur
 
-        self.freq_max = max(self.freq_max, freq)
-        self.freq_min = min(self.freq_min, freq)
+        if freq > self.freq_max:
+            self.freq_max = freq
+        if freq < self.freq_min:
+            self.freq_min = freq
         self.count += 1
-        self.freq_mean = self.freq_mean + (freq - self.freq_mean) / float(self.count)
+        self.freq_sum += freq
 
 
 class EventLimiter(object):
@@ -131,11 +144,13 @@ class NormalizationContext(AbstractHashQueueContext):
         self.OVERFLOW_TIME_SPAN_US = float(1 << 32) / self.soc_frequency
         self.OVERFLOW_TIME_TOLERANCE = self.OVERFLOW_TIME_SPAN_US * 0.05  # allow for some tolerance
         self.ignore_crit = ignore_crit
-        self.prev_event_data: dict[int, dict[str, EventStats]] = {}
+        self.prev_event_data: dict[int | str, dict[str, EventStats]] = {}
         self.flex_name_ts_map = FlexEventMapToTS()
         self.event_filter = self.extract_eventfilters(filterstr)
         self.event_count = 0
         self.event_limit = event_limit
+        # job names by jobhash, traces have only a few distinct jobs
+        self._jobnames: dict[int, str] = {}
 
     def __del__(self) -> None:
         def _print_freq_minmax(key: str):
@@ -179,33 +194,62 @@ class NormalizationContext(AbstractHashQueueContext):
         _print_freq_minmax(self._DURATION_KEY)
         _print_freq_minmax(self._INTERVAL_KEY)
 
-    def queue_hash(self, event: TraceEvent) -> int:
-        return hash(event["pid"])
+    def get_jobname(self, jobhash: int) -> str:
+        jobname = self._jobnames.get(jobhash)
+        if jobname is None:
+            jobname = _jobinfo.get_job(jobhash)
+            self._jobnames[jobhash] = jobname
+        return jobname
 
-    def extract_eventfilters(self, filterstr: str) -> dict[str, re.Pattern]:
-        event_filters: dict[str, re.Pattern] = {}
+    def queue_hash(self, event: TraceEvent) -> int | str:
+        # the pid is hashable as is (usually an int, trace formats also allow strings);
+        # hash() would also map pid -1 onto -2
+        return event["pid"]
+
+    def extract_eventfilters(self, filterstr: str) -> list[tuple[tuple[str, ...], re.Pattern]]:
+        event_filters: dict[str, list[re.Pattern]] = {}
         if len(filterstr.strip()) == 0:
-            return event_filters
+            return []
         for fstr in filterstr.split(","):
             key_regex = fstr.split(":")
             if len(key_regex) != 2:
                 aiulog.log(aiulog.WARN, "FLTR: key:regex pattern not found in event filter. Skipping", fstr)
                 continue
-            event_filters[key_regex[0]] = re.compile(rf"{key_regex[1]}")
+            event_filters.setdefault(key_regex[0], []).append(re.compile(rf"{key_regex[1]}"))
         aiulog.log(
             aiulog.INFO,
-            f"FLTR: Event filtering is active. {len(event_filters)} filters enabled:",
+            f"FLTR: Event filtering is active. {sum(len(f) for f in event_filters.values())} filters enabled:",
             event_filters)
-        return event_filters
+        # split the attribute paths once instead of for every event
+        return [(tuple(attr.split('.')), regex)
+                for attr, regexes in event_filters.items()
+                for regex in self._combine_filters(regexes)]
+
+    @staticmethod
+    def _combine_filters(regexes: list[re.Pattern]) -> list[re.Pattern]:
+        # match all filters of the same attribute with a single alternation.
+        # Patterns with groups (backreferences would get renumbered) or inline flags
+        # (only allowed at the start of a pattern) stay separate filters.
+        joinable, separate = [], []
+        for r in regexes:
+            if r.groups == 0 and _INLINE_FLAGS.search(r.pattern) is None:
+                joinable.append(r)
+            else:
+                separate.append(r)
+        if len(joinable) < 2:
+            return regexes
+        return [re.compile("|".join(f"(?:{r.pattern})" for r in joinable))] + separate
 
     def event_filtered(self, event: TraceEvent) -> bool:
-        for attr, regex in self.event_filter.items():
-            attr_tree = attr.split('.')
-            e = event
-            for a in attr_tree:
-                if a not in e:
-                    break
-                e = e[a]
+        for attr_tree, regex in self.event_filter:
+            if len(attr_tree) == 1:
+                e = event.get(attr_tree[0], event)
+            else:
+                e = event
+                for a in attr_tree:
+                    if a not in e:
+                        break
+                    e = e[a]
 
             if not isinstance(e, dict) and regex.search(str(e)) is not None:
                 return True
@@ -293,17 +337,19 @@ class NormalizationContext(AbstractHashQueueContext):
 
         args = event["args"]
         prev = -(1 << 48)  # set something very small to cover for some negative overflow epochs to happen
-        for ts in ["TS1", "TS2", "TS3", "TS4", "TS5"]:
+        for ts in _TS_KEYS:
             curr = int(args[ts], 0)
             if curr < prev:
-                if "TSxOF" not in event["args"]:
-                    event["args"]["TSxOF"] = ts
-                aiulog.log(aiulog.TRACE, "OVC: intra-event TSx overflow:", event["args"])
+                if "TSxOF" not in args:
+                    args["TSxOF"] = ts
+                aiulog.log(aiulog.TRACE, "OVC: intra-event TSx overflow:", args)
                 # currently hard-coded 1 epoch
                 # event-duration-based epochs require analysis of circular dependency
                 # between cycle->time and time->cycle conversions
                 curr += 1 << 32
             args[ts] = str(curr)
+            if ts == ref_ts:
+                ref_cycle = curr
             prev = curr
 
         if event["dur"] > self.OVERFLOW_TIME_SPAN_US:
@@ -312,9 +358,9 @@ class NormalizationContext(AbstractHashQueueContext):
         qid = self.queue_hash(event)
         self.update_reference_overflow(
             qid,
-            str(event["args"]["jobhash"]),
+            str(args["jobhash"]),
             event["ts"],
-            int(event["args"][ref_ts]))
+            ref_cycle)
 
         if "Cmpt Exec" not in event["name"]:
             return args
@@ -331,20 +377,22 @@ class NormalizationContext(AbstractHashQueueContext):
                 self._INTERVAL_KEY: EventStats()}
 
         ts_a, ts_b = self.flex_name_ts_map[event["name"]]
-        dur_cycles = int(event["args"][ts_b]) - int(event["args"][ts_a])
+        cycles = (int(event["args"][ts_a]), int(event["args"][ts_b]))
+        ts_dur = (event["ts"], event["dur"])
+        dur_cycles = cycles[1] - cycles[0]
         dur_freq = float(dur_cycles) / event["dur"]
-        aiulog.log(aiulog.TRACE,
-                   f"{event['args'][ts_a]:10} {event['args'][ts_b]:10} {dur_cycles:10}"
-                   f" {event['dur']:15} {dur_freq:12.3f} |{event['name']}")
-        self.prev_event_data[qid][self._DURATION_KEY].update(
-            (int(event["args"][ts_a]), int(event["args"][ts_b])),
-            (event["ts"], event["dur"]),
-            dur_freq)
+        if aiulog.is_enabled(aiulog.TRACE):
+            aiulog.log(aiulog.TRACE,
+                       f"{event['args'][ts_a]:10} {event['args'][ts_b]:10} {dur_cycles:10}"
+                       f" {event['dur']:15} {dur_freq:12.3f} |{event['name']}")
+        event_stats = self.prev_event_data[qid]
+        event_stats[self._DURATION_KEY].update(cycles, ts_dur, dur_freq)
 
         # compute anticipated frequency based on event interval to previous event
-        if self.prev_event_data[qid][self._INTERVAL_KEY].count > 0:
-            gap_cycles = int(event["args"][ts_a]) - self.prev_event_data[qid][self._INTERVAL_KEY].get_start_cycle()
-            gap_time = event["ts"] - self.prev_event_data[qid][self._INTERVAL_KEY].get_start_ts()
+        interval_stats = event_stats[self._INTERVAL_KEY]
+        if interval_stats.count > 0:
+            gap_cycles = cycles[0] - interval_stats.get_start_cycle()
+            gap_time = event["ts"] - interval_stats.get_start_ts()
             # Handle zero gap_time to avoid division by zero
             if gap_time > 0:
                 gap_freq = float(gap_cycles) / gap_time
@@ -354,10 +402,7 @@ class NormalizationContext(AbstractHashQueueContext):
                 gap_freq = dur_freq
         else:
             gap_freq = dur_freq
-        self.prev_event_data[qid][self._INTERVAL_KEY].update(
-            (int(event["args"][ts_a]), int(event["args"][ts_b])),
-            (event["ts"], event["dur"]),
-            gap_freq)
+        interval_stats.update(cycles, ts_dur, gap_freq)
 
     def tsx_32bit_global_correction(self, qid, event: TraceEvent) -> dict:
         if "TS1" in event["args"]:
@@ -368,10 +413,10 @@ class NormalizationContext(AbstractHashQueueContext):
                                                         int(event["args"]["TS1"]))
             aiulog.log(aiulog.TRACE, "OVC: DRIFT:", event["name"], ovc, drift, tofix, self.frequency_minmax)
 
+            ovc_cycles = ovc << 32
             prev = -(1 << 48)  # set something very small to cover for some negative overflow epochs to happen
-            for ts in ["TS1", "TS2", "TS3", "TS4", "TS5"]:
-                curr = int(args[ts], 0)
-                curr += (ovc * 1 << 32)
+            for ts in _TS_KEYS:
+                curr = int(args[ts], 0) + ovc_cycles
                 if curr < prev:
                     self.warnings["ts_seq_err"].update()
                     if not self.ignore_crit:
@@ -395,25 +440,25 @@ def _attr_to_args(event: TraceEvent) -> TraceEvent:
     Turns k/v entries made under 'attr' into k/v under args
     '''
     if "attr" in event:
-        if "args" not in event:
-            event["args"] = copy.deepcopy({})
-        for k, v in event["attr"].items():
-            event["args"][k] = copy.deepcopy(v)
-        event.pop("attr")
+        args = event.setdefault("args", {})
+        for k, v in event.pop("attr").items():
+            # scalars are immutable, only containers need a copy to not alias the input
+            args[k] = copy.deepcopy(v) if isinstance(v, (dict, list)) else v
     return event
 
 
 def _hex_to_int_str(event: TraceEvent) -> TraceEvent:
-    if "args" in event:
-        if not isinstance(event["args"], dict):
-            return event
-
-        for k in ["TS1", "TS2", "TS3", "TS4", "TS5", "Power"]:
-            if k in event["args"] and isinstance(event["args"][k], str):
-                try:
-                    event["args"][k] = str(int(event["args"][k], 0))
-                except ValueError:
-                    pass  # do nothing and leave the value alone
+    args = event.get("args")
+    if not isinstance(args, dict):
+        return event
+
+    for k in _HEX_KEYS:
+        v = args.get(k)
+        if isinstance(v, str):
+            try:
+                args[k] = str(int(v, 0))
+            except ValueError:
+                pass  # do nothing and leave the value alone
     return event
 
 
@@ -429,17 +474,13 @@ def _capitalized_args(event: TraceEvent) -> TraceEvent:
     return event
 
 
-_unify_recv = re.compile("Receive")
-_unify_rdma = re.compile("RDMA")
 _jobinfo = GlobalIngestData()
 
 
 # deal with the different naming schemes for the same kind of event
 # instead of writing more complex detection patters, let's unify the names instead
 def _name_unification(name: str) -> str:
-    new_name = _unify_rdma.sub("Rdma", name)
-    new_name = _unify_recv.sub("Recv", new_name)
-    return new_name
+    return name.replace("RDMA", "Rdma").replace("Receive", "Recv")
 
 
 def normalize_phase1(event: TraceEvent, context: AbstractContext) -> list[TraceEvent]:
@@ -449,7 +490,7 @@ def normalize_phase1(event: TraceEvent, context: AbstractContext) -> list[TraceE
         return []
 
     # don't let anything pass that's not in X-event
-    if event["ph"] not in ["X"]:
+    if event["ph"] != "X":
         return [event]
 
     event = _attr_to_args(event)
@@ -460,8 +501,9 @@ def normalize_phase1(event: TraceEvent, context: AbstractContext) -> list[TraceE
     if context.event_filtered(event):
         return []
 
-    event["args"]["jobname"] = _jobinfo.get_job(event["args"]["jobhash"])
-    if "args" in event and "TS1" in event["args"]:
+    args = event["args"]
+    args["jobname"] = context.get_jobname(args["jobhash"])
+    if "TS1" in args:
         event["args"] = context.tsx_32bit_local_correction(event)
 
     assert isinstance(event, dict)
@@ -472,10 +514,11 @@ def normalize_phase2(event: TraceEvent, context: AbstractContext) -> list[TraceE
     assert isinstance(context, NormalizationContext)
 
     # don't let anything pass that's not in X-event
-    if event["ph"] not in ["X"]:
+    if event["ph"] != "X":
         return [event]
 
-    if "args" in event and "TS1" in event["args"]:
+    args = event.get("args")
+    if args is not None and "TS1" in args:
         qid = context.queue_hash(event)
         event["args"] = context.tsx_32bit_global_correction(qid, event)
         aiulog.log(aiulog.TRACE, "NORM after:", id(event["args"]), event)
@@ -1,5 +1,10 @@
 # Copyright 2024-2026 IBM Corporation
 
+from array import array
+from bisect import bisect_right
+
+import numpy as np
+
 import aiu_trace_analyzer.logger as aiulog
 from aiu_trace_analyzer.types import TraceEvent
 from aiu_trace_analyzer.pipeline import AbstractContext
@@ -16,60 +21,65 @@ class PowerStatisticsContext(AbstractContext):
 
     def __init__(self):
         super().__init__()
-        # Stores computed intervals: [(start_ts, end_ts, power_value), ...]
-        self.power_periods = []
+        # Stores computed intervals as parallel arrays of start_ts, end_ts, power_value
+        self.power_starts = array('d')
+        self.power_ends = array('d')
+        self.power_values = array('d')
         # Keeps track of the previous power sample to form intervals on-the-fly
         self.last_power_sample = None
 
-        # Collect kernel periods: [(start_ts, end_ts), ...]
-        self.kernel_periods = []
+        # Collect kernel periods as parallel arrays of start_ts, end_ts
+        self.kernel_starts = array('d')
+        self.kernel_ends = array('d')
 
-    def _merge_periods(self, periods):
+    def _merge_periods(self, starts, ends):
         """
         Merge overlapping time periods into non-overlapping segments.
         Essential to prevent double-counting duration when kernels overlap.
         """
-        if not periods:
+        if len(starts) == 0:
             return []
 
-        sorted_periods = sorted(periods)
-        merged = [sorted_periods[0]]
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        order = np.lexsort((ends, starts))
+        starts = starts[order]
+        # running max of the end times is the end of the segment merged so far
+        running_end = np.maximum.accumulate(ends[order])
 
-        for start, end in sorted_periods[1:]:
-            last_start, last_end = merged[-1]
-            if start <= last_end:
-                # Overlapping, merge by extending the end time
-                merged[-1] = (last_start, max(last_end, end))
-            else:
-                # Non-overlapping, add as a new distinct segment
-                merged.append((start, end))
+        # a period that starts after everything before it has ended opens a new segment
+        seg_first = np.flatnonzero(np.concatenate(([True], starts[1:] > running_end[:-1])))
+        seg_last = np.append(seg_first[1:] - 1, len(starts) - 1)
+        return list(zip(starts[seg_first].tolist(), running_end[seg_last].tolist()))
 
-        return merged
-
-    def _split_power_period(self, power_start, power_end, power_value, kernel_timeline):
+    def _split_power_period(self, power_start, power_end, power_value, kernel_timeline,
+                            with_kernels, without_kernels, first_kernel=0):
         """
         Slice a single power measurement period into sub-segments based on kernel activity.
+        The (duration, power) segments are appended to with_kernels or without_kernels.
+        The merged kernel_timeline is sorted, so the scan starts at first_kernel and stops
+        at the first kernel beginning after the power period.
         """
-        segments = []
         current_pos = power_start
 
-        for k_start, k_end in kernel_timeline:
-            if k_end <= power_start or k_start >= power_end:
+        for k_idx in range(first_kernel, len(kernel_timeline)):
+            k_start, k_end = kernel_timeline[k_idx]
+            if k_start >= power_end:
+                break
+            if k_end <= power_start:
                 continue
 
             overlap_start = max(power_start, k_start)
             overlap_end = min(power_end, k_end)
 
             if current_pos < overlap_start:
-                segments.append((overlap_start - current_pos, power_value, False))
+                without_kernels.append((overlap_start - current_pos, power_value))
 
-            segments.append((overlap_end - overlap_start, power_value, True))
+            with_kernels.append((overlap_end - overlap_start, power_value))
             current_pos = overlap_end
 
         if current_pos < power_end:
-            segments.append((power_end - current_pos, power_value, False))
-
-        return segments
+            without_kernels.append((power_end - current_pos, power_value))
 
     def _compute_weighted_stats(self, segments):
         """
@@ -78,38 +88,35 @@ class PowerStatisticsContext(AbstractContext):
         if not segments:
             return None
 
-        total_duration = sum(dur for dur, _ in segments)
-        weighted_sum_total = sum(dur * power for dur, power in segments)
-        avg_total = weighted_sum_total / total_duration if total_duration > 0 else 0
+        durations, powers = np.array(segments, dtype=np.float64).T
+        total_duration = durations.sum()
+        avg_total = np.dot(durations, powers) / total_duration if total_duration > 0 else 0
 
-        non_zero_segments = [(dur, p) for dur, p in segments if p > 0]
-        non_zero_duration = sum(dur for dur, p in non_zero_segments)
+        non_zero = powers > 0
+        nz_durations = durations[non_zero]
+        nz_powers = powers[non_zero]
+        non_zero_duration = nz_durations.sum()
 
-        mean_non_zero = (sum(dur * p for dur, p in non_zero_segments) / non_zero_duration
+        mean_non_zero = (np.dot(nz_durations, nz_powers) / non_zero_duration
                          if non_zero_duration > 0 else 0)
 
         median_non_zero = 0
-        if non_zero_segments:
-            sorted_segments = sorted(non_zero_segments, key=lambda x: x[1])
-            half_nz_dur = non_zero_duration / 2
-            cumulative_dur = 0
-            for dur, power in sorted_segments:
-                cumulative_dur += dur
-                if cumulative_dur >= half_nz_dur:
-                    median_non_zero = power
-                    break
-
-        all_powers = [p for _, p in segments]
-        nz_powers = [p for _, p in non_zero_segments]
+        if nz_powers.size > 0:
+            # weighted median: first power at which the sorted cumulative duration reaches half
+            order = np.argsort(nz_powers, kind="stable")
+            cumulative_dur = np.cumsum(nz_durations[order])
+            median_idx = np.searchsorted(cumulative_dur, non_zero_duration / 2)
+            if median_idx < cumulative_dur.size:
+                median_non_zero = float(nz_powers[order[median_idx]])
 
         return {
-            'min_non_zero': min(nz_powers) if nz_powers else 0.0,
-            'max': max(all_powers) if all_powers else 0.0,
-            'mean_non_zero': mean_non_zero,
+            'min_non_zero': float(nz_powers.min()) if nz_powers.size > 0 else 0.0,
+            'max': float(powers.max()),
+            'mean_non_zero': float(mean_non_zero),
             'median_non_zero': median_non_zero,
-            'avg_total': avg_total,
-            'dur_total': total_duration,
-            'dur_non_zero': non_zero_duration
+            'avg_total': float(avg_total),
+            'dur_total': float(total_duration),
+            'dur_non_zero': float(non_zero_duration)
         }
 
     def drain(self):
@@ -117,26 +124,24 @@ class PowerStatisticsContext(AbstractContext):
         Compute and report time-weighted power statistics after all events processed.
         """
         # Reviewer's optimization: No more sorting here, power_periods are pre-computed.
-        if not self.power_periods:
+        if len(self.power_starts) == 0:
             aiulog.log(aiulog.WARN, "Insufficient power data (need at least 2 samples) for statistics")
             return []
 
         # Step 1: Clean up kernel timeline (merging overlapping kernels)
-        kernel_timeline = self._merge_periods(self.kernel_periods)
-
-        # Step 2: Fragment power periods by kernel activity
-        all_segments = []
-        for start, end, power in self.power_periods:
-            all_segments.extend(self._split_power_period(start, end, power, kernel_timeline))
-
-        # Step 3: Group segments into Scenarios
-        with_kernels = [(dur, p) for dur, p, has_k in all_segments if has_k]
-        without_kernels = [(dur, p) for dur, p, has_k in all_segments if not has_k]
-
-        if not self.kernel_periods and not without_kernels:
-            without_kernels = [(dur, p) for dur, p, _ in all_segments]
-
-        # Step 4: Compute and Log results
+        kernel_timeline = self._merge_periods(self.kernel_starts, self.kernel_ends)
+
+        # Step 2: Fragment power periods by kernel activity into the two scenarios
+        # merged kernels don't overlap, so their end times are sorted as well
+        kernel_ends = [end for _, end in kernel_timeline]
+        with_kernels = []
+        without_kernels = []
+        for start, end, power in zip(self.power_starts, self.power_ends, self.power_values):
+            first_kernel = bisect_right(kernel_ends, start)
+            self._split_power_period(start, end, power, kernel_timeline,
+                                     with_kernels, without_kernels, first_kernel)
+
+        # Step 3: Compute and Log results
         for label, data in [("Power with kernels", with_kernels),
                             ("Power without kernels", without_kernels)]:
             stats = self._compute_weighted_stats(data)
@@ -156,6 +161,37 @@ class PowerStatisticsContext(AbstractContext):
         return []
 
 
+def _collect_power_sample(event: TraceEvent, context: PowerStatisticsContext) -> None:
+    ts = event.get("ts")
+    args = event.get("args")
+    # ts=0.0 is a valid sample (e.g. after zero-alignment)
+    if ts is None or not args or "Watts" not in args:
+        return
+
+    # Since events are sorted, we can form the interval from the last sample to current ts
+    last_power_sample = context.last_power_sample
+    if last_power_sample:
+        last_ts, last_watts = last_power_sample
+        if ts > last_ts:
+            context.power_starts.append(last_ts)
+            context.power_ends.append(ts)
+            context.power_values.append(last_watts)
+
+    context.last_power_sample = (ts, args["Watts"])
+
+
+def _collect_kernel_period(event: TraceEvent, context: PowerStatisticsContext) -> None:
+    name = event.get("name")
+    if name is None or "Cmpt Exec" not in name:
+        return
+
+    ts = event.get("ts")
+    dur = event.get("dur", 0)
+    if ts is not None and dur > 0:
+        context.kernel_starts.append(ts)
+        context.kernel_ends.append(ts + dur)
+
+
 def analyze_power_statistics(event: TraceEvent, context: AbstractContext) -> list[TraceEvent]:
     """
     Dispatcher to collect raw power and kernel timing data from the trace.
@@ -163,27 +199,12 @@ def analyze_power_statistics(event: TraceEvent, context: AbstractContext) -> lis
     """
     assert isinstance(context, PowerStatisticsContext)
 
-    ts = event.get("ts")
-    if not ts:
-        return [event]
-
-    # Identify Power Counter events
-    if event.get("ph") == "C" and event.get("name") == "Power":
-        if "args" in event and "Watts" in event["args"]:
-            current_watts = event["args"]["Watts"]
-
-            # Since events are sorted, we can form the interval from the last sample to current ts
-            if context.last_power_sample:
-                last_ts, last_watts = context.last_power_sample
-                if ts > last_ts:
-                    context.power_periods.append((last_ts, ts, last_watts))
-
-            context.last_power_sample = (ts, current_watts)
-
-    # Identify Kernel execution periods
-    elif event.get("ph") == "X" and "Cmpt Exec" in event.get("name", ""):
-        dur = event.get("dur", 0)
-        if dur > 0:
-            context.kernel_periods.append((ts, ts + dur))
+    # dispatch on ph and name before touching any other field
+    ph = event.get("ph")
+    if ph == "C":
+        if event.get("name") == "Power":
+            _collect_power_sample(event, context)
+    elif ph == "X":
+        _collect_kernel_period(event, context)
 
     return [event]
@@ -7,6 +7,7 @@ import json
 from math import isclose
 import pathlib
 from enum import Flag, auto
+from typing import Optional
 
 import aiu_trace_analyzer.logger as aiulog
 from aiu_trace_analyzer.types import TraceEvent, TraceWarning
@@ -15,14 +16,15 @@ from aiu_trace_analyzer.pipeline.tools import PipelineContextTool
 from aiu_trace_analyzer.pipeline.barrier import TwoPhaseWithBarrierContext
 from aiu_trace_analyzer.pipeline.tools import KernelDetailsDB, AutopilotDetail
 
+import numpy as np
 import pandas as pd
-pd.set_option('display.max_rows', None)
-pd.set_option('display.max_columns', None)
-pd.set_option('display.width', None)
 
 RCU_pt_util_counter_name = "PT Active"
 RCU_pt_util_counter_unit = "Percent"
 
+# key layout of the utilization counter events; copied and filled per kernel event
+_util_counter_template = {"ph": "C", "ts": 0.0, "pid": 0, "name": RCU_pt_util_counter_name, "args": None}
+
 # for table fingerprint: include only event names that match this regex
 _fprint_event_filter = r'^.*'
 
@@ -58,38 +60,44 @@ class RCUTableFingerprint():
         self.reset()
 
     def get(self) -> int:
+        if self.hash is None:
+            # hash based on data and totaltime (distinguish same sequence for different input sizes)
+            self.hash = hash(self.fprint_data + str(self.totaltime))
         return self.hash
 
+    @property
+    def fprint_data(self) -> str:
+        # built on demand from the kernel hashes instead of growing a string with every add()
+        if self._fprint_data is None:
+            self._fprint_data = "".join(f"{converted}{self._separator}" for converted in self.data_hashes)
+        return self._fprint_data
+
     def get_table_mode(self) -> str:
         return self.table_mode
 
     def add(self, data: str, time: float) -> None:
         if self.dataitems < self.datalimit and self.event_filter.search(data) is not None:
-            aiulog.log(aiulog.DEBUG, f"adding to FP: {data}, Hash: {hash(data)}")
-            converted = self._data_conversion(data)
-            self.fprint_data += f"{converted}{self._separator}"
-            self.data_hashes.append(converted)
+            if aiulog.is_enabled(aiulog.DEBUG):
+                aiulog.log(aiulog.DEBUG, f"adding to FP: {data}, Hash: {hash(data)}")
+            self.data_hashes.append(self._data_conversion(data))
+            self._fprint_data = None
 
         # item count and accumulated time needed for non-hash similarity checks
         self.dataitems += 1
         self.totaltime += time
-        self._update_hash()
+        self.hash = None
 
     def _data_conversion(self, data: str):
         # enough variety to build a rough 'alphabet' of kernel names
         # no big deal if some collisions occur
         return hash(data) % 65535
 
-    def _update_hash(self) -> None:
-        # hash based on data and totaltime (distinguish same sequence for different input sizes)
-        self.hash = hash(self.fprint_data + str(self.totaltime))
-
     def reset(self) -> None:
-        self.fprint_data: str = ""
         self.data_hashes: list[int] = []
+        self._fprint_data: str | None = ""
         self.dataitems: int = 0
         self.totaltime = 0.0
-        self._update_hash()
+        self.hash: int | None = None
 
     def similarity(self, other) -> float:
         """
@@ -100,41 +108,50 @@ class RCUTableFingerprint():
            * impossible: other.dataitems < self.dataitems
            * impossible: other.totaltime > self.totaltime
         """
-        aiulog.log(aiulog.DEBUG, "FPRINT SIMILARITY: -----------------")
-        # kernel sequence similarity
-        sim_val = self.sim_weights["sequence"] * (1.0 if other.fprint_data.find(self.fprint_data) != -1 else 0.5)
-        matched = "sub-sequence not found" if sim_val < self.sim_weights["sequence"] else "sub-sequence found"
-        aiulog.log(
-            aiulog.DEBUG, "   SIMVAL(sequence):",
-            f"{sim_val}  <- ({matched}, {other.fprint_data.find(self.fprint_data)})")
-
-        # table-length similarity
+        # runs for every job x table pair: only build the detailed log messages when they are printed
+        debug = aiulog.is_enabled(aiulog.DEBUG)
+        if debug:
+            aiulog.log(aiulog.DEBUG, "FPRINT SIMILARITY: -----------------")
+        # exclude impossible table candidates before searching the kernel sequence
         if self.dataitems > other.dataitems:
-            aiulog.log(
-                aiulog.DEBUG, "   SIMVAL(tablelen):",
-                f"{0.0}  <- (events={self.dataitems} > table={other.dataitems})")
+            if debug:
+                aiulog.log(
+                    aiulog.DEBUG, "   SIMVAL(tablelen):",
+                    f"{0.0}  <- (events={self.dataitems} > table={other.dataitems})")
             return 0.0
 
-        sim_val += self.sim_weights["tab_len"] * (self.dataitems / other.dataitems)
-        aiulog.log(
-            aiulog.DEBUG, "   SIMVAL(tablelen):",
-            f"{sim_val}  <- ({self.dataitems} / {other.dataitems} = {self.dataitems / other.dataitems})")
-
-        # exclude table canditate if
         if other.totaltime > self.totaltime:
-            aiulog.log(
-                aiulog.DEBUG, "   SIMVAL(totaltim):",
-                f"0.0  <- ({other.totaltime} / {self.totaltime} = {other.totaltime / self.totaltime})")
+            if debug:
+                aiulog.log(
+                    aiulog.DEBUG, "   SIMVAL(totaltim):",
+                    f"{0.0}  <- (table={other.totaltime} > events={self.totaltime})")
             return 0.0
 
+        # kernel sequence similarity
+        seq_pos = other.fprint_data.find(self.fprint_data)
+        sim_val = self.sim_weights["sequence"] * (1.0 if seq_pos != -1 else 0.5)
+        if debug:
+            matched = "sub-sequence not found" if seq_pos == -1 else "sub-sequence found"
+            aiulog.log(
+                aiulog.DEBUG, "   SIMVAL(sequence):",
+                f"{sim_val}  <- ({matched}, {seq_pos})")
+
+        # table-length similarity
+        sim_val += self.sim_weights["tab_len"] * (self.dataitems / other.dataitems)
+        if debug:
+            aiulog.log(
+                aiulog.DEBUG, "   SIMVAL(tablelen):",
+                f"{sim_val}  <- ({self.dataitems} / {other.dataitems} = {self.dataitems / other.dataitems})")
+
         # total-time similarity
         if isclose(self.totaltime, 0.0, abs_tol=1e-9):
             zero_match_factor = int(isclose(other.totaltime, 0.0, abs_tol=1e-9)) * 1.0
             sim_val += self.sim_weights["total_time"] * zero_match_factor
         sim_val += self.sim_weights["total_time"] * (other.totaltime / self.totaltime)
-        aiulog.log(
-            aiulog.DEBUG, "   SIMVAL(totaltim):",
-            f"{sim_val}  <- ({other.totaltime} / {self.totaltime} = {other.totaltime / self.totaltime})")
+        if debug:
+            aiulog.log(
+                aiulog.DEBUG, "   SIMVAL(totaltim):",
+                f"{sim_val}  <- ({other.totaltime} / {self.totaltime} = {other.totaltime / self.totaltime})")
         return sim_val
 
 
@@ -149,14 +166,13 @@ class RCUKernelCategoryMap():
         return key in self.kernel_cat_map
 
     def add(self, key: str, value: str) -> str:
-        if key not in self.kernel_cat_map:
-            self.kernel_cat_map[key] = value
-        elif value != self.kernel_cat_map[key]:
+        known = self.kernel_cat_map.setdefault(key, value)
+        if value != known:
             aiulog.log(
                 aiulog.WARN,
                 "UTL: Kernel->Category map already has an entry with different category:",
-                key, value, self.kernel_cat_map[key])
-        return self.kernel_cat_map[key]
+                key, value, known)
+        return known
 
     def values(self):
         return self.kernel_cat_map.values()
@@ -306,6 +322,10 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
     _category_splitter = re.compile(r'(\-opCat|\-NA$)')
     _autopilot_pattern = re.compile(r'DSM-AutoPilot BEGIN')
     _iteration_mode_pattern = re.compile(r'^\s+(DECODING|PREFILL)\s+$')
+    # any of the section/setting markers above; lets plain lines skip the individual checks
+    _marker_pattern = re.compile(
+        r'DSM-AutoPilot BEGIN|Ideal Clock Scaling:|^\s+(?:DECODING|PREFILL)\s+$'
+        r'| Ideal/Total Cycles |====== Perf Summary End ======')
     _non_kernel_names = [""]
 
     _print_to_log = False
@@ -351,10 +371,11 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
             if os.path.isfile(compiler_info):
                 # Workload is running on current stack
                 subdir, fpat = '/'.join(compiler_info.split('/')[:-1]), compiler_info.split('/')[-1]
-                matches = list(pathlib.Path(subdir).rglob(fpat))
-                if not matches:
+                # only the first match is used: stop the directory walk there
+                compiler_log = next(pathlib.Path(subdir).rglob(fpat), None)
+                if compiler_log is None:
                     raise FileNotFoundError(f"No files matching pattern: {fpat}")
-                self.extract_tables(compiler_log=matches[0])
+                self.extract_tables(compiler_log=compiler_log)
             elif os.path.isdir(compiler_info):
                 # Workload is running on the Torch Spyre stack
                 self.extract_tables_from_inductor_dir(compiler_info)
@@ -365,8 +386,9 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
         except ValueError as e:
             aiulog.log(aiulog.ERROR, e)
 
-        for _, t in self.kernel_cycles.items():
-            self.autopilot_detail = AutopilotDetail(t)
+        # only the last table's details are kept: skip building (deepcopy + sha256) the others
+        if self.kernel_cycles:
+            self.autopilot_detail = AutopilotDetail(next(reversed(self.kernel_cycles.values())))
             self.table_hash = self.autopilot_detail.table_hash()
 
     def __del__(self) -> None:
@@ -395,10 +417,11 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
 
     def initialize_tables(self) -> None:
         self.kernel_cycles: dict[int, dict[str, int]] = {}  # tables indexed by fingerprint
+        self.kernel_ideal_time: dict[int, dict[str, float]] = {}  # same tables, pre-scaled to time
         self.categories = {}
         self.kernel_cat_map: dict[int, RCUKernelCategoryMap] = {}
         self.fingerprints: dict[int, RCUTableFingerprint] = {}
-        self.hash_to_pid: dict[int, int] = {}
+        self.hash_to_pid: dict[tuple[int, int], tuple[int, int]] = {}
 
     def _start_init_table(self, table_mode: str) -> tuple[dict, RCUTableFingerprint]:
         self.multi_table += 1
@@ -423,7 +446,9 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
                 f"UTL: Adding ideal cycles table ({fprint.get_table_mode()}) with fingerprint: {fprint_key}")
             aiulog.log(aiulog.DEBUG, f"UTL:    TablefprintStr: {fprint.fprint_data}")
         self.fingerprints[fprint_key] = fprint
-        self.kernel_cycles[fprint_key] = copy.deepcopy(table)
+        # every table section starts with a fresh dict (_start_init_table), no copy needed
+        self.kernel_cycles[fprint_key] = table
+        self.kernel_ideal_time[fprint_key] = {k: v * self.cycle_to_clock_factor for k, v in table.items()}
         # re-assign temp kernel-cat-map to actual fingerprint
         self.kernel_cat_map[fprint_key] = self.kernel_cat_map.pop(0)
         fprint = None
@@ -446,21 +471,18 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
         kernel = kernel_and_cat[0] + _kernel_event_name_postfix
         fprint.add(kernel, cycles * self.cycle_to_clock_factor)
 
-        if kernel not in current_table:
+        known_cycles = current_table.get(kernel)
+        if known_cycles is None:
             aiulog.log(aiulog.TRACE, "UTL: Kernel:", kernel)
             if cycles != 0:
                 current_table[kernel] = cycles
-        elif cycles != current_table[kernel]:
+        elif cycles != known_cycles:
             aiulog.log(aiulog.WARN,
                        "UTL: Kernel already has an entry with different cycle count:",
-                       kernel, cycles, current_table[kernel])
+                       kernel, cycles, known_cycles)
 
-        if kernel not in self.kernel_cat_map[0]:
-            self.kernel_cat_map[0].add(kernel, category)
-        elif category != self.kernel_cat_map[0][kernel]:
-            aiulog.log(aiulog.WARN,
-                       "UTL: Kernel->Category map already has an entry with different category:",
-                       kernel, category, self.kernel_cat_map[0][kernel])
+        # add() keeps an existing entry and warns about a conflicting category
+        self.kernel_cat_map[0].add(kernel, category)
         return fprint
 
     def _detect_autopilot_line(self, line: str) -> bool:
@@ -503,15 +525,15 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
                    parse_mode, self.multi_table)
         return parse_mode, current_table, fprint
 
-    def _process_table_line(self,
-                            line: str,
-                            fprint: RCUTableFingerprint,
-                            parse_mode: RCUTableParseMode,
-                            current_table: dict[str, int]) -> tuple[
-                                bool,
-                                bool,
-                                dict[str, int],
-                                RCUTableFingerprint]:
+    def _process_marker_line(self,
+                             line: str,
+                             fprint: RCUTableFingerprint,
+                             parse_mode: RCUTableParseMode,
+                             current_table: dict[str, int]) -> tuple[
+                                 bool,
+                                 bool,
+                                 dict[str, int],
+                                 RCUTableFingerprint]:
 
         # detect autopilot on/off
         if self._detect_autopilot_line(line):
@@ -530,35 +552,49 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
             return True, parse_mode, current_table, fprint
 
         # don't bother checking for the end_pattern if we're not even in parse mode
-        if RCUTableParseMode.ACTIVE_TABLE not in parse_mode:
-            return True, parse_mode, current_table, fprint
-
-        if self._end_pattern.search(line):
+        if RCUTableParseMode.ACTIVE_TABLE in parse_mode and self._end_pattern.search(line):
             aiulog.log(aiulog.DEBUG, "UTL: End of Ideal Cycle Count section detected. Stopping parse mode.")
             parse_mode &= ~RCUTableParseMode.ACTIVE_TABLE  # reset to scanning/no table
             self._finish_add_table(fprint, current_table)
-            return True, parse_mode, current_table, fprint
+        return True, parse_mode, current_table, fprint
+
+    def _process_table_line(self,
+                            line: str,
+                            fprint: RCUTableFingerprint,
+                            parse_mode: RCUTableParseMode,
+                            current_table: dict[str, int]) -> tuple[
+                                bool,
+                                bool,
+                                dict[str, int],
+                                RCUTableFingerprint]:
 
-        # This will need to be the last regex check because it skips everything else
-        if not self._data_pattern.search(line) or self._ignore_pattern.search(line):
+        # one scan for all markers; marker lines are never data lines
+        if self._marker_pattern.search(line) is not None:
+            return self._process_marker_line(line, fprint, parse_mode, current_table)
+
+        # data lines only matter inside a table section
+        if RCUTableParseMode.ACTIVE_TABLE not in parse_mode:
             return True, parse_mode, current_table, fprint
 
-        ldata = re.split(" +", line)
-        if len(ldata) < 2 or len(ldata) > 3:  # strange format includes newline as a 3rd column
-            aiulog.log(
-                aiulog.WARN,
-                "UTL: found data pattern line with more than 2 columns. Check patterns.",
-                ldata)
+        if self._data_pattern.match(line) is None or self._ignore_pattern.search(line):
             return True, parse_mode, current_table, fprint
 
-        cycles = int(ldata[1])
-        kernel_and_cat = self._category_splitter.split(ldata[0])
+        # data pattern guarantees exactly: kernel name, cycles
+        kernel, cycles = line.split()
+        # common rows have one '-opCat' suffix or none: same result as the regex split without running it
+        head, sep, tail = kernel.partition("-opCat")
+        if kernel.endswith("-NA") or "-opCat" in tail:
+            kernel_and_cat = self._category_splitter.split(kernel)
+        elif sep:
+            kernel_and_cat = [head, sep, tail]
+        else:
+            kernel_and_cat = [kernel]
 
         # Skip anything that's not a kernel name
         if kernel_and_cat[0] in self._non_kernel_names:
             return True, parse_mode, current_table, fprint
 
-        fprint = self._add_kernel(kernel_and_cat, cycles, current_table, fprint)
+        fprint = self._add_kernel(kernel_and_cat, int(cycles), current_table, fprint)
         return True, parse_mode, current_table, fprint
 
     def extract_tables(self, compiler_log: pathlib.Path):
@@ -567,7 +603,9 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
         self.multi_table = -1  # track if there might be multiple tables in the log
         current_table = {}
         fprint = None  # fingerprints created when a new table is detected
-        with open(compiler_log, 'r') as cl:
+        # compiler logs can be large: read in big chunks; table rows are plain ASCII, so
+        # replacing undecodable bytes elsewhere in the log cannot change the parsed tables
+        with open(compiler_log, 'r', buffering=1 << 20, encoding='utf-8', errors='replace') as cl:
 
             for line in cl:
                 (
@@ -602,13 +640,6 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
                     self.kernel_cat_map[0].add(kernel_name, category)
         self._finish_add_table(fprint, current_table)
 
-    @staticmethod
-    def _compute_row_stats(dur, total, ideal, ideal_total):
-        dur_frac = 0 if isclose(total, 0.0, abs_tol=1e-9) else round(dur / total, 4)
-        ideal_frac = 0 if isclose(ideal_total, 0.0, abs_tol=1e-9) else round(ideal / ideal_total, 4)
-        pt_util = 0 if isclose(dur, 0.0, abs_tol=1e-9) else round(ideal / dur, 4)
-        return dur_frac, ideal_frac, pt_util
-
     def print_table_as_pd(self, cat_tab):
         """
         Generate time breakdown along kernel categories
@@ -631,7 +662,8 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
                      "Ideal_Time", "Ideal_Cyc", "Frac_Ideal", "PT_Util"]
         aiulog.log(aiulog.DEBUG, "UTL: category title_row: ", title_row)
 
-        list_of_list = []
+        columns = {t: [] for t in ("Pid", "Phase", "Category", "Kernel_Time", "Calls", "Ideal_Time")}
+        totals, ideal_totals = [], []
         for p, data in cat_tab.items():
             if len(data) == 0:
                 return
@@ -642,52 +674,72 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
             except KeyError:
                 aiulog.log(aiulog.WARN, "UTL: Unexpected entry in category tables", fp_key)
                 phase = "UNKN"
-            total = data["Total"][0]
-            ideal_total = data["Total"][1]
 
+            rows = len(data)
+            columns["Pid"] += [pid] * rows
+            columns["Phase"] += [phase] * rows
+            totals += [data["Total"][0]] * rows
+            ideal_totals += [data["Total"][1]] * rows
             for k, (dur, ideal, calls) in data.items():
-                ideal_cyc = int(ideal / abs(self.cycle_to_clock_factor))
-
-                # prevent div-by-zero exception
-                dur_frac, ideal_frac, pt_util = RCUUtilizationContext._compute_row_stats(dur, total, ideal, ideal_total)
-
-                # note: to sync the columns of value_row with title_row
-                value_row = [pid, phase, k, dur, dur_frac, calls, round(ideal, 4), ideal_cyc, ideal_frac, pt_util]
-                list_of_list.append(value_row)
-
-                aiulog.log(aiulog.DEBUG, "UTL: category value_row: ", value_row)
+                columns["Category"].append(k)
+                columns["Kernel_Time"].append(dur)
+                columns["Calls"].append(calls)
+                columns["Ideal_Time"].append(ideal)
+
+        dur = np.array(columns["Kernel_Time"], dtype=float)
+        ideal = np.array(columns["Ideal_Time"], dtype=float)
+        total = np.array(totals, dtype=float)
+        ideal_total = np.array(ideal_totals, dtype=float)
+
+        # prevent div-by-zero: near-zero denominators yield a zero ratio
+        with np.errstate(divide="ignore", invalid="ignore"):
+            columns["Frac_Time"] = np.where(np.abs(total) > 1e-9, np.round(dur / total, 4), 0.0)
+            columns["Frac_Ideal"] = np.where(np.abs(ideal_total) > 1e-9, np.round(ideal / ideal_total, 4), 0.0)
+            columns["PT_Util"] = np.where(np.abs(dur) > 1e-9, np.round(ideal / dur, 4), 0.0)
+        columns["Ideal_Time"] = np.round(ideal, 4)
+        columns["Ideal_Cyc"] = (ideal / abs(self.cycle_to_clock_factor)).astype(np.int64)
+
+        # note: column order follows title_row
+        df = pd.DataFrame({t: columns[t] for t in title_row})
+        if aiulog.is_enabled(aiulog.DEBUG):
+            aiulog.log(aiulog.DEBUG, "UTL: category rows:\n", df.to_string())
 
         # the sorting places the "Total" row to the last of each section (section per pid) of the table.
-        df = pd.DataFrame(list_of_list, columns=title_row)
         sorted_df = df.sort_values([title_row[0], title_row[1], title_row[3]],
                                    kind='stable', inplace=False, ignore_index=True)
 
-        sorted_df.to_csv(self.csv_fname, index=False, header=True)                   # dump to CSV file
-        print(sorted_df.to_string(index=False), file=open(self.tab_fname, 'w'))    # dump to TXT file
+        with open(self.csv_fname, 'w', newline='', buffering=1 << 20) as csv_fd:    # dump to CSV file
+            sorted_df.to_csv(csv_fd, index=False, header=True)
+        with open(self.tab_fname, 'w', buffering=1 << 20) as tab_fd:                # dump to TXT file
+            sorted_df.to_string(tab_fd, index=False)
+            tab_fd.write('\n')
 
         aiulog.log(aiulog.INFO, "UTL: category table(s) created as CSV:", self.csv_fname)
         aiulog.log(aiulog.INFO, "UTL: category table(s) created as TXT:", self.tab_fname)
 
     # if there's no category table for the pid, create a new one from the known category keys
     def set_categories_for_pid(self, pid, fprint) -> None:
-        cat_hash = hash(fprint+pid)
+        cat_hash = (fprint, pid)
         if cat_hash in self.categories:
             return
-        else:
-            aiulog.log(aiulog.DEBUG, "UTL: Creating new categories table for", cat_hash)
-            # always have the StcdpHbm category
-            self.categories[cat_hash] = {"Total": (0.0, 0.0, 0), "StcdpHbm": (0.0, 0.0, 0)}
-            self.hash_to_pid[cat_hash] = (pid, fprint)
 
-        for cat in self.kernel_cat_map[fprint].values():
-            self.categories[cat_hash][cat] = (0.0, 0.0, 0)
+        aiulog.log(aiulog.DEBUG, "UTL: Creating new categories table for", cat_hash)
+        # always have the StcdpHbm category
+        # entries are mutable [dur, ideal_dur, count] lists, updated in place per event
+        cat_tab = {"Total": [0.0, 0.0, 0], "StcdpHbm": [0.0, 0.0, 0]}
+        cat_tab.update({cat: [0.0, 0.0, 0] for cat in self.kernel_cat_map[fprint].values()})
+        self.categories[cat_hash] = cat_tab
+        self.hash_to_pid[cat_hash] = (pid, fprint)
 
     def get_cycles(self, kernel: str, fprint: int) -> int:
-        if len(self.kernel_cycles):
-            rval = self.kernel_cycles[fprint].get(kernel, 0)
-            return rval
-        else:
-            return 0
+        if self.kernel_cycles:
+            return self.kernel_cycles[fprint].get(kernel, 0)
+        return 0
+
+    def get_ideal_time(self, kernel: str, fprint: int) -> float:
+        if self.kernel_ideal_time:
+            return self.kernel_ideal_time[fprint].get(kernel, 0.0)
+        return 0.0
 
     def accumulate_categories(self, pid, kernel, ideal_dur, duration, fprint):
         if kernel not in self.kernel_cat_map[fprint]:
@@ -700,16 +752,18 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
         if ideal_dur > duration:
             ideal_dur = 0.0
 
-        cat_hash = hash(fprint+pid)
+        cat_hash = (fprint, pid)
         cat = self.kernel_cat_map[fprint][kernel]
-        self.set_categories_for_pid(pid, fprint)
-        aiulog.log(aiulog.TRACE, "UTL: ", kernel, cat, duration, ideal_dur, self.categories[cat_hash][cat])
-
-        dur, i_dur, cnt = self.categories[cat_hash][cat]
-        self.categories[cat_hash][cat] = (dur+duration, i_dur+ideal_dur, cnt+1)
-
-        dur, i_dur, cnt = self.categories[cat_hash]["Total"]
-        self.categories[cat_hash]["Total"] = (dur+duration, i_dur+ideal_dur, cnt+1)
+        cat_tab = self.categories.get(cat_hash)
+        if cat_tab is None:
+            self.set_categories_for_pid(pid, fprint)
+            cat_tab = self.categories[cat_hash]
+        aiulog.log(aiulog.TRACE, "UTL: ", kernel, cat, duration, ideal_dur, cat_tab[cat])
+
+        for entry in (cat_tab[cat], cat_tab["Total"]):
+            entry[0] += duration
+            entry[1] += ideal_dur
+            entry[2] += 1
         return cat
 
     def _add_final_zero_event(self, pending_zero: TraceEvent, final: bool = False) -> list[TraceEvent]:
@@ -765,7 +819,6 @@ class RCUUtilizationContext(AbstractContext, PipelineContextTool):
 
 
 class MultiRCUUtilizationContext(TwoPhaseWithBarrierContext, PipelineContextTool):
-    _name_converter = re.compile(r"\[N\]")
     _total_cycles_kernel_name = "Total"
     _utilization_fallback_value = 101.0
     """
@@ -844,8 +897,10 @@ class MultiRCUUtilizationContext(TwoPhaseWithBarrierContext, PipelineContextTool
             rname = self._total_cycles_kernel_name
 
         # if a fn_idx was removed from the event name, we have to bring it back in to match the ideal cycles table entry
-        if "[N]" in rname and "args" in event and "fn_idx" in event["args"]:
-            rname = self._name_converter.sub(str(event["args"]["fn_idx"]), event["name"], count=1)
+        if "[N]" in rname:
+            fn_idx = event.get("args", {}).get("fn_idx")
+            if fn_idx is not None:
+                rname = rname.replace("[N]", str(fn_idx), 1)
 
         if not rname.endswith(_kernel_event_name_postfix):
             rname += _kernel_event_name_postfix
@@ -853,8 +908,7 @@ class MultiRCUUtilizationContext(TwoPhaseWithBarrierContext, PipelineContextTool
         return rname
 
     def get_ideal_dur(self, kernel: str, pid: int, fingerprint: int) -> float:
-        rank = pid * self.rank_factor
-        return self.rcuctx[rank].get_cycles(kernel, fingerprint) * self.rcuctx[rank].cycle_to_clock_factor
+        return self.rcuctx[pid * self.rank_factor].get_ideal_time(kernel, fingerprint)
 
     def accumulate_categories(self, pid, kernel, ideal_dur, duration, fprint):
         rank = pid * self.rank_factor
@@ -873,7 +927,7 @@ class MultiRCUUtilizationContext(TwoPhaseWithBarrierContext, PipelineContextTool
     # ignores input utilization if autopilot is enabled (separate computation, delayed counter creation)
     def make_utilization_event(self, event: TraceEvent, utilization: float, jobhash: int) -> list[TraceEvent]:
         revents: list[TraceEvent] = []
-        log_str_100 = ""
+        util_source = None
         rank = event["pid"] * self.rank_factor
 
         if self.rcuctx[rank].autopilot:
@@ -890,32 +944,36 @@ class MultiRCUUtilizationContext(TwoPhaseWithBarrierContext, PipelineContextTool
 
         else:
             # TODO: this should be refactored to maybe use RCUAutopilotCounter, too
-            revents = [TraceEvent({
-                    "ph": "C",
-                    "ts": event["ts"],
-                    "pid": event["pid"],
-                    "name": RCU_pt_util_counter_name,
-                    "args": {RCU_pt_util_counter_unit: utilization},
-                    "dur": event["dur"]  # temporary duration in cycles- remove before viz
-                })]
+            counter = TraceEvent(_util_counter_template)
+            counter["ts"] = event["ts"]
+            counter["pid"] = event["pid"]
+            counter["args"] = {RCU_pt_util_counter_unit: utilization}
+            counter["dur"] = event["dur"]  # temporary duration in cycles- remove before viz
+            revents = [counter]
             if utilization > 0.0:   # add a reset-to-zero event only if util is non-zero
-                revents.append(TraceEvent({
-                    "ph": "C",
-                    "ts": event["ts"]+event["dur"],
-                    "pid": event["pid"],
-                    "name": RCU_pt_util_counter_name,
-                    "args": {RCU_pt_util_counter_unit: 0.0}
-                }))
-            log_str_100 = f"(pid, utilization, event) {event['pid']}, {utilization}, {event}"
+                zero = TraceEvent(_util_counter_template)
+                zero["ts"] = event["ts"]+event["dur"]
+                zero["pid"] = event["pid"]
+                zero["args"] = {RCU_pt_util_counter_unit: 0.0}
+                revents.append(zero)
+            util_source = (event, utilization)
 
-        revents = self._check_counter_sanity(revents, log_str_100)
+        revents = self._check_counter_sanity(revents, util_source)
 
         return revents
 
-    def _check_counter_sanity(self, counters: list[TraceEvent], log_str: str) -> list[TraceEvent]:
+    def _check_counter_sanity(
+            self,
+            counters: list[TraceEvent],
+            util_source: Optional[tuple[TraceEvent, float]] = None) -> list[TraceEvent]:
         # check sanity of generated counter events
         for idx, counter in enumerate(counters):
             if counter["args"][RCU_pt_util_counter_unit] > 100.0:
+                # source event details only formatted for the (rare) warning
+                log_str = ""
+                if util_source is not None:
+                    event, utilization = util_source
+                    log_str = f"(pid, utilization, event) {event['pid']}, {utilization}, {event}"
                 aiulog.log(aiulog.WARN, "UTL: Event with +100% utilization. "
                            "This could indicate a problem with table fingerprinting: ",
                            log_str, counter)
@@ -924,11 +982,10 @@ class MultiRCUUtilizationContext(TwoPhaseWithBarrierContext, PipelineContextTool
         return counters
 
     def update_fprint_matches(self):
+        # table fingerprints are final at this point; collect them once for all jobs
+        table_fprints = [fprint for table in self.rcuctx.values() for fprint in table.fingerprints.values()]
         for job, event_fprint in self.fingerprints.items():
-            matching_fprints = []
-            for table in self.rcuctx.values():
-                for fprint in table.fingerprints.values():
-                    matching_fprints.append((fprint, event_fprint.similarity(fprint)))
+            matching_fprints = [(fprint, event_fprint.similarity(fprint)) for fprint in table_fprints]
 
             if len(matching_fprints) == 0:
                 continue
@@ -956,7 +1013,7 @@ class MultiRCUUtilizationContext(TwoPhaseWithBarrierContext, PipelineContextTool
             new_event, pending_zero = counter.create_counter_event(RCU_pt_util_counter_name, RCU_pt_util_counter_unit)
             rank = new_event["pid"] * self.rank_factor
             revents += self.rcuctx[rank].handle_counter_overlap(new_event, pending_zero, final=True)
-            revents = self._check_counter_sanity(revents, "")
+            revents = self._check_counter_sanity(revents)
 
         return revents + super().drain()
 
@@ -973,7 +1030,7 @@ def compute_utilization_fingerprints(event: TraceEvent, context: AbstractContext
 
     assert isinstance(context, MultiRCUUtilizationContext)
 
-    if PipelineContextTool.is_acc_event(event) and PipelineContextTool.is_acc_kernel(event):
+    if PipelineContextTool.is_acc_kernel_event(event):
         kernel_name = context.extract_kernel_from_event_name(event)
 
         context.fingerprint_add(context.generate_fprint_jobhash(event), kernel_name, event["dur"])
@@ -986,7 +1043,7 @@ def compute_utilization(event: TraceEvent, context: AbstractContext) -> list[Tra
 
     assert isinstance(context, MultiRCUUtilizationContext)
 
-    if not PipelineContextTool.is_acc_event(event) or not PipelineContextTool.is_acc_kernel(event):
+    if not PipelineContextTool.is_acc_kernel_event(event):
         return [event]
 
     pid = event["pid"]
@@ -1003,8 +1060,9 @@ def compute_utilization(event: TraceEvent, context: AbstractContext) -> list[Tra
     try:
         ideal_dur = float(context.get_ideal_dur(kernel_name, pid, job_fingerprint))
     except KeyError:
-        aiulog.log(aiulog.DEBUG, f"UTL: No kernel table matching fingerprint {job_fingerprint}:"
-                   f" {context.fingerprints.keys()}/{context.fingerprints[jobhash].fprint_data} ")
+        if aiulog.is_enabled(aiulog.DEBUG):
+            aiulog.log(aiulog.DEBUG, f"UTL: No kernel table matching fingerprint {job_fingerprint}:"
+                       f" {context.fingerprints.keys()}/{context.fingerprints[jobhash].fprint_data} ")
         context.issue_warning("kernel_nomatch")
         ideal_dur = 0.0
 
@@ -52,13 +52,26 @@ class EventSortingContext(EventPairDetectionContext):
         self.queues[queue_id].append(event)
         return []
 
+    def _sort_key_fn(self):
+        # the key is computed once per event; keep the common single-key case free of tuple building
+        if len(self.sortkey) == 1:
+            k, rev = self.sortkey[0]
+            # primary key is always present (checked in sort())
+            if rev == 1:
+                return lambda x: float(x[k])
+            return lambda x: -float(x[k])
+
+        sortkey = [(k, float(rev)) for k, rev in self.sortkey]
+        return lambda x: tuple([rev * float(x.get(k, 0.0)) for k, rev in sortkey])
+
     def drain(self):
         drained_events = []
-        for _, q in self.queues.items():
-            q.sort(key=lambda x: tuple([float(rev) * float(x[k] if k in x else 0.0) for k, rev in self.sortkey]))
-        while len(self.queues.keys()) > 0:
-            queue_id = list(self.queues.keys())[0]
-            drained_events += self.queues.pop(queue_id)
+        sort_key = self._sort_key_fn()
+        for q in self.queues.values():
+            q.sort(key=sort_key)
+        for q in self.queues.values():
+            drained_events.extend(q)
+        self.queues.clear()
         return drained_events
 
 
@@ -59,7 +59,8 @@ class DurationStat(Stat):
         # convert dict to dataframe | pid | elapsed_time|
         df = pd.DataFrame(list(dur_dict.items()), columns=[_PID_COL, _DURATION_COL])
 
-        aiulog.log(aiulog.TRACE, f"STATS_V2: Get DurationStat {df}")
+        if aiulog.is_enabled(aiulog.TRACE):
+            aiulog.log(aiulog.TRACE, f"STATS_V2: Get DurationStat\n{df.to_string()}")
         return df
 
 
@@ -82,7 +83,8 @@ class TimeAccumStat(Stat):
         # convert dict to dataframe | pid | accum_active_time|
         df = pd.DataFrame(list(self.accum_time.items()), columns=[_PID_COL, name+_TIMEACCUM_COL])
 
-        aiulog.log(aiulog.TRACE, f"STATS_V2: Get TimeAccumStat {df}")
+        if aiulog.is_enabled(aiulog.TRACE):
+            aiulog.log(aiulog.TRACE, f"STATS_V2: Get TimeAccumStat\n{df.to_string()}")
         return df
 
 
@@ -166,7 +168,8 @@ class EventStatsTrackerContext(AbstractContext, PipelineContextTool):
             stat_df = self.get_stat(name)
             tracker_df = pd.merge(tracker_df, stat_df, on=_PID_COL, how="outer", validate='one_to_one')
 
-        aiulog.log(aiulog.TRACE, f"STATS_V2: Drain {tracker_df} ")
+        if aiulog.is_enabled(aiulog.TRACE):
+            aiulog.log(aiulog.TRACE, f"STATS_V2: Drain\n{tracker_df.to_string()}")
 
         # Check if contains for total elapase time
         # Currently, only assume 1 _DURATION_COL column and n _TIMEACCUM_COL columns
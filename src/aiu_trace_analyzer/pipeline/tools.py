@@ -2,9 +2,8 @@
 
 import hashlib
 import json
-import copy
 import re
-from typing import Optional
+from typing import Callable, Optional
 
 from aiu_trace_analyzer.types import TraceEvent, GlobalIngestData, InputDialect
 import aiu_trace_analyzer.logger as aiulog
@@ -18,6 +17,8 @@ class PipelineContextTool:
         # build a filename from the provided output file
         # remove ".pt.trace" if present as it is only needed for the output json for tensorboard use
         fname = fname.replace(".pt.trace", "")
+        # drop the compression suffix of gzipped trace outputs
+        fname = fname.removesuffix(".gz")
 
         # insert _summary before the last '.' and replace the .nnn with .csv
         fcomponents = fname.split('.')
@@ -32,21 +33,24 @@ class PipelineContextTool:
 
     @staticmethod
     def get_dialect_of_event(event: TraceEvent) -> InputDialect | None:
-        if "args" not in event:
+        args = event.get("args")
+        if args is None:
             return None
-        if "jobhash" not in event["args"]:
+        jobhash = args.get("jobhash")
+        if jobhash is None:
             print("ERROR: no jobhash in event. You hit a bug in the code.")
             return None
-        return GlobalIngestData.get_dialect(event["args"]["jobhash"])
+        return GlobalIngestData.get_dialect(jobhash)
 
     @staticmethod
     def get_context_id(event: TraceEvent) -> int:
         dialect = PipelineContextTool.get_dialect_of_event(event)
         if dialect is None:
             return 0
-        if dialect.get("NAME") == "FLEX":
+        dialect_name = dialect.get("NAME")
+        if dialect_name == "FLEX":
             return event["args"]["jobhash"]
-        elif dialect.get("NAME") == "TORCH":
+        elif dialect_name == "TORCH":
             return event["args"]["correlation"]
         else:
             return 0
@@ -67,54 +71,97 @@ class PipelineContextTool:
     def is_acc_kernel(event: TraceEvent) -> bool:
         return PipelineContextTool.is_category(event, "acc_kernel")
 
+    @staticmethod
+    def is_acc_kernel_event(event: TraceEvent) -> bool:
+        '''
+        Same as is_acc_event() and is_acc_kernel(), resolving the event dialect only once
+        '''
+        dialect = PipelineContextTool.get_dialect_of_event(event)
+        if not dialect:
+            return False
+
+        get_classifier = PipelineContextTool.get_category_classifier
+        return get_classifier(dialect, "acc_event_cat")(event) and get_classifier(dialect, "acc_kernel")(event)
+
+    # dialect classifiers compiled into predicates, keyed by (dialect name, category, classifier string)
+    _classifiers: dict[tuple[str, str, str], Callable[[TraceEvent], bool]] = {}
+
     @staticmethod
     def is_category(event: TraceEvent, category: str) -> bool:
         dialect = PipelineContextTool.get_dialect_of_event(event)
         if not dialect:
             return False
 
-        deconstruct = dialect.get(category).split(';')
+        return PipelineContextTool.get_category_classifier(dialect, category)(event)
+
+    @staticmethod
+    def get_category_classifier(dialect: InputDialect, category: str) -> Callable[[TraceEvent], bool]:
+        '''
+        Returns the compiled predicate for a dialect category, for callers that check
+        several categories of the same event and resolve its dialect only once
+        '''
+        entry = dialect.get(category)
+        key = (dialect.get("NAME"), category, entry)
+        classifier = PipelineContextTool._classifiers.get(key)
+        if classifier is None:
+            classifier = PipelineContextTool._compile_classifier(dialect, category, entry)
+            PipelineContextTool._classifiers[key] = classifier
+        return classifier
+
+    @staticmethod
+    def _compile_classifier(dialect: InputDialect, category: str, entry: str) -> Callable[[TraceEvent], bool]:
+        # parse the dialect entry once and return a predicate that only has to evaluate the event
+        deconstruct = entry.split(';')
 
         classifier = deconstruct[0].split('.')
 
         if len(classifier) == 1:
-            return event["name"] == classifier[0]
+            name = classifier[0]
+            return lambda event: event["name"] == name
 
         if classifier[0] == "is":
-            attribute = event
-            for c in classifier[1:]:
-                if c in attribute:
-                    attribute = attribute[c]
-                else:
-                    return False
-            assert isinstance(attribute, dict) is False, \
-                f"Attribute '{attribute}' is not a leaf node in '{category}'" \
-                f"classifier of {dialect.get("NAME")} dialect."
+            attribute_path = classifier[1:]
             compare_str = ';'.join(deconstruct[1:])  # recombined remaining parts of the string
             assert len(compare_str) > 0, f"Incorrect format '{category}' classifier of {dialect.get("NAME")} dialect."
-            classifier_re = re.compile(compare_str)
-            return (classifier_re.search(str(attribute)) is not None)
+            classifier_search = re.compile(compare_str).search
+
+            def _is_match(event: TraceEvent) -> bool:
+                attribute = event
+                for c in attribute_path:
+                    if c in attribute:
+                        attribute = attribute[c]
+                    else:
+                        return False
+                assert isinstance(attribute, dict) is False, \
+                    f"Attribute '{attribute}' is not a leaf node in '{category}'" \
+                    f"classifier of {dialect.get("NAME")} dialect."
+                return (classifier_search(str(attribute)) is not None)
+            return _is_match
 
         elif classifier[0] == "has":
             assert len(classifier) > 1, f"Not enough parameters in '{category}' classifier. 'has' requires at least 1"
-
-            attribute = event
-            for c in classifier[1:]:
-                if c in attribute:
-                    attribute = attribute[c]
-                else:
-                    return False
-            return True
+            attribute_path = classifier[1:]
+
+            def _has_attribute(event: TraceEvent) -> bool:
+                attribute = event
+                for c in attribute_path:
+                    if c in attribute:
+                        attribute = attribute[c]
+                    else:
+                        return False
+                return True
+            return _has_attribute
 
         else:
             aiulog.log(aiulog.WARN, f"Dialect entry for {category} has unknown operator:", classifier[0])
-        return False
+        return lambda event: False
 
 
 class AutopilotDetail:
     def __init__(self, kernelmap: dict[str, int] = None) -> None:
         if kernelmap is not None:
-            self.kernelmap = copy.deepcopy(kernelmap)
+            # flat kernel -> cycles map: a shallow copy is a full copy
+            self.kernelmap = dict(kernelmap)
         else:
             self.kernelmap = {}
 
@@ -176,8 +223,12 @@ class KernelDetailsDB:
 
 
 class FlexEventMapToTS(object):
+    _NAME_CACHE_LIMIT = 1 << 16
+
     def __init__(self):
         self.map: dict[str, tuple[str, str]] = {}
+        # lookup results by full event name; names repeat a lot within a trace
+        self._by_name: dict[str, Optional[tuple[str, str]]] = {}
         self.add("DmaI", ("TS1", "TS2"))
         self.add("Cmpt Prep", ("TS2", "TS3"))
         self.add("Cmpt Exec", ("TS3", "TS4"))
@@ -187,9 +238,19 @@ class FlexEventMapToTS(object):
             ev_str: str,
             ts_entries: tuple[str, str]) -> None:
         self.map[ev_str] = ts_entries
+        self._by_name.clear()
 
     def __getitem__(self, event_name: str) -> Optional[tuple[str, str]]:
+        try:
+            return self._by_name[event_name]
+        except KeyError:
+            pass
+
+        ts_entries = None
         for k, v in self.map.items():
             if k in event_name:
-                return v
-        return None
+                ts_entries = v
+                break
+        if len(self._by_name) < self._NAME_CACHE_LIMIT:
+            self._by_name[event_name] = ts_entries
+        return ts_entries
@@ -4,6 +4,9 @@ import json
 
 
 class TraceView(object):
+    # number of trace events serialized per write when dumping to a file
+    DUMP_CHUNK_SIZE = 4096
+
     def __init__(
         self,
         trace_events=[],
@@ -78,10 +81,33 @@ class TraceView(object):
         dic.update(self.meta_data)
 
         if fp:
-            json.dump(dic, fp, indent=4)
+            self._dump_chunked(dic, fp)
         else:
             return json.dumps(dic)
 
+    def _dump_chunked(self, dic: dict, fp) -> None:
+        """
+        stream the trace json into fp with one trace event per line
+
+        json.dump() runs the pure-python encoder over the whole structure (slow for large traces);
+        serializing events individually uses the C encoder and only keeps one chunk of
+        serialized events in memory at a time
+        """
+        fp.write("{\n")
+        for idx, (key, value) in enumerate(dic.items()):
+            fp.write(",\n" if idx else "")
+            if key != "traceEvents":
+                nested_value = json.dumps(value, indent=4).replace("\n", "\n    ")
+                fp.write(f"    {json.dumps(key)}: {nested_value}")
+                continue
+
+            fp.write(f"    {json.dumps(key)}: [\n        ")
+            for start in range(0, len(value), self.DUMP_CHUNK_SIZE):
+                fp.write(",\n        " if start else "")
+                fp.write(",\n        ".join(json.dumps(event) for event in value[start:start + self.DUMP_CHUNK_SIZE]))
+            fp.write("\n    ]")
+        fp.write("\n}\n")
+
 
 class AbstractEventType(object):
     def _del_none(self, dic):
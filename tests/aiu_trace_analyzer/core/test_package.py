@@ -0,0 +1,24 @@
+# Copyright 2024-2026 IBM Corporation
+
+import types
+
+import pytest
+
+import aiu_trace_analyzer
+
+
+@pytest.mark.parametrize('name', ["pipeline", "logger", "core", "ingest", "export", "types"])
+def test_submodule_attribute(name):
+    module = getattr(aiu_trace_analyzer, name)
+    assert isinstance(module, types.ModuleType)
+    assert module.__name__ == f"aiu_trace_analyzer.{name}"
+
+
+def test_pipeline_name_attribute():
+    from aiu_trace_analyzer.pipeline import EventSortingContext
+    assert aiu_trace_analyzer.EventSortingContext is EventSortingContext
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        aiu_trace_analyzer.no_such_name
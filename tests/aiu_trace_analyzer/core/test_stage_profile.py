@@ -98,3 +98,32 @@ def test_sparse_profile_ordinal_targets_single_occurrence(tmp_path):
     assert len(enabled_at) == 1
     # confirm it is the second occurrence, not the first
     assert sum(1 for name, _ in profile.profile[:enabled_at[0] + 1] if name == "pipeline_barrier") == 2
+
+
+def test_fwd_find_recurring_stage(torch_minimal_profile):
+    checker = StageProfileChecker(StageProfile.from_json(torch_minimal_profile))
+
+    # each lookup of a recurring stage advances to its next occurrence
+    found = [checker.fwd_find_stage("pipeline_barrier") for _ in range(4)]
+    assert found == [False, True, True, True]
+
+    # past the last occurrence: not found and the index stays put
+    reg_idx = checker.reg_idx
+    assert checker.fwd_find_stage("pipeline_barrier") is False
+    assert checker.reg_idx == reg_idx
+
+
+def test_profile_ingest_keeps_input_data(torch_minimal_profile, everything_profile):
+    with open(torch_minimal_profile, 'r') as fd:
+        profile_data = json.load(fd)
+    with open(everything_profile, 'r') as fd:
+        all_stages = json.load(fd)
+    profile_copy = json.loads(json.dumps(profile_data))
+    all_copy = json.loads(json.dumps(all_stages))
+
+    # the same data can be ingested repeatedly without being consumed
+    first = StageProfile(profile_data, all_stages)
+    second = StageProfile(profile_data, all_stages)
+    assert first.profile == second.profile
+    assert profile_data == profile_copy
+    assert all_stages == all_copy
@@ -0,0 +1,110 @@
+# Copyright 2024-2026 IBM Corporation
+
+import gzip
+import json
+import pytest
+
+import aiu_trace_analyzer.trace_view as tv
+from aiu_trace_analyzer.export.exporter import DataframeExporter, JsonFileTraceExporter, TensorBoardFileTraceExporter
+
+
+@pytest.fixture
+def df_exporter(tmp_path):
+    return DataframeExporter(f"{tmp_path}/df_test_out.txt")
+
+
+def test_dataframe_export(df_exporter):
+    events = [
+        tv.CompleteEvents(name="a", cat="kernel", ts=1.0, dur=2.0, pid=0, tid=0,
+                          args={"rank": 1, "class": "COMPUTE_EXEC", "bytes": 128}),
+        tv.CompleteEvents(name="b", cat="kernel", ts=5.0, dur=1.0, pid=0, tid=0),
+        tv.CounterEvents(name="c", ts=2.0, pid=0, args={"v": 1}),
+    ]
+    df_exporter.export(events)
+    df_exporter.flush()
+    df = df_exporter.get_data()
+
+    # non-X events are skipped
+    assert len(df) == 2
+    assert list(df.columns) == [v[0] for v in df_exporter.data_map.values()]
+    assert list(df["Rank"]) == [1, 0]
+    assert list(df["Event CLass"]) == ["COMPUTE_EXEC", "UNKNOWN"]
+    assert list(df["Size"]) == [128, 0.0]
+    assert list(df["Timestamp"]) == [1.0, 5.0]
+
+
+def test_dataframe_export_empty(df_exporter):
+    df_exporter.flush()
+    df = df_exporter.get_data()
+    assert len(df) == 0
+    assert list(df.columns) == [v[0] for v in df_exporter.data_map.values()]
+
+
+def test_dataframe_export_duplicate_titles(tmp_path):
+    exporter = DataframeExporter(f"{tmp_path}/df_test_out.txt", data_map={"ts": ("A", 0.0), "dur": ("A", 0.0)})
+    exporter.export([tv.CompleteEvents(name="a", cat="kernel", ts=1.0, dur=2.0, pid=0, tid=0),
+                     tv.CompleteEvents(name="b", cat="kernel", ts=3.0, dur=4.0, pid=0, tid=0)])
+    exporter.flush()
+    df = exporter.get_data()
+    assert list(df.columns) == ["A", "A"]
+    assert df.values.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+
+@pytest.mark.parametrize("event_count", [0, 1, 10000])
+def test_json_export_file_matches_data(tmp_path, event_count):
+    out_file = f"{tmp_path}/json_test_out.json"
+    exporter = JsonFileTraceExporter(out_file)
+    exporter.export([
+        tv.CompleteEvents(name=f"ev{i}", cat="kernel", ts=float(i), dur=1.0, pid=0, tid=0, args={"rank": 0})
+        for i in range(event_count)])
+    exporter.flush()
+
+    with open(out_file, 'r') as f:
+        file_data = json.load(f)
+    assert file_data == json.loads(exporter.get_data())
+    assert len(file_data["traceEvents"]) == event_count
+
+
+def test_json_export_keeps_event_dicts(tmp_path):
+    exporter = JsonFileTraceExporter(f"{tmp_path}/json_test_out.json")
+    events = [tv.CompleteEvents(name="a", cat="kernel", ts=1.0, dur=1.0, pid=0, tid=0),
+              tv.CounterEvents(name="c", ts=2.0, pid=0, args={"v": 1})]
+    exporter.export(events)
+    exporter.export([])
+
+    # events are buffered as their dicts without a copy
+    assert len(exporter.traceview.trace_events) == len(events)
+    for buffered, event in zip(exporter.traceview.trace_events, events):
+        assert buffered is event.json()
+
+
+def test_tensorboard_split_by_rank(tmp_path):
+    exporter = TensorBoardFileTraceExporter(f"{tmp_path}/tb_test_out.pt.trace.json")
+    exporter.export([
+        tv.CompleteEvents(name=f"ev{pid}", cat="kernel", ts=1.0, dur=1.0, pid=pid, tid=0)
+        for pid in [0, 1, 1000, 1001, -1]])
+    exporter.add_device(0, {"name": "dev0"})
+    exporter.add_device(1, {"name": "dev1"})
+    exporter.flush()
+
+    assert exporter.rank_cnt == 2
+    for rid in range(exporter.rank_cnt):
+        with open(f"{tmp_path}/tb_test_out_worker_{rid}.pt.trace.json", 'r') as f:
+            rank_data = json.load(f)
+        assert [e["pid"] for e in rank_data["traceEvents"]] == [rid, rid + 1000]
+        assert rank_data["deviceProperties"] == [{"id": rid, "name": f"dev{rid}"}]
+
+
+def test_tensorboard_gz_output(tmp_path):
+    exporter = TensorBoardFileTraceExporter(f"{tmp_path}/tb_test_out.pt.trace.json.gz")
+    exporter.export([
+        tv.CompleteEvents(name=f"ev{pid}", cat="kernel", ts=1.0, dur=1.0, pid=pid, tid=0)
+        for pid in [0, 1, -1]])
+    exporter.flush()
+
+    assert exporter.rank_cnt == 2
+    with gzip.open(f"{tmp_path}/tb_test_out.pt.trace.json.gz", 'rt') as f:
+        assert json.load(f) == json.loads(exporter.get_data())
+    for rid in range(exporter.rank_cnt):
+        with gzip.open(f"{tmp_path}/tb_test_out_worker_{rid}.pt.trace.json.gz", 'rt') as f:
+            assert json.load(f) == json.loads(exporter.get_tb_data(rid))
@@ -0,0 +1,221 @@
+# Copyright 2024-2026 IBM Corporation
+
+import pytest
+
+from aiu_trace_analyzer.types import TraceEvent, GlobalIngestData, InputDialectTORCH
+from aiu_trace_analyzer.pipeline.categorize import EventCategorizerContext, EventClass, _COMM_NAMES
+
+
+@pytest.fixture
+def cat_ctx():
+    return EventCategorizerContext()
+
+
+comm_name_test_cases = [
+    ("Cmpt Exec", 0),
+    ("Host DMA Wait for ACK", _COMM_NAMES.HOST_DMA | _COMM_NAMES.WAIT_ACK),
+    # a fragment implies the tokens of fragments it contains
+    ("HCOLL Signal", _COMM_NAMES.HOST_DMA | _COMM_NAMES.SIGNAL_DATA),
+    ("Wait for Notice (gather notifications)", _COMM_NAMES.WAIT_DATA | _COMM_NAMES.MONITOR_NOTICE),
+    # overlapping fragments are all reported
+    ("Host DMAWdone DmaI", _COMM_NAMES.HOST_DMA | _COMM_NAMES.WAIT_DATA),
+    ("Xseg to rank 3", _COMM_NAMES.SERIAL),
+]
+
+
+@pytest.mark.parametrize("name, tokens", comm_name_test_cases)
+def test_comm_name_matcher(name, tokens):
+    assert _COMM_NAMES.match(name) == tokens
+    # memoized result has to be identical
+    assert _COMM_NAMES.match(name) == tokens
+
+
+classify_comm_test_cases = [
+    ({"name": "AllReduce Host DMA R5 Wait DATA", "args": {"CollGroup": 1}},
+     EventClass.OTHER, EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA),
+    ({"name": "AllReduce Host DMA Send ACK Instruction", "args": {"CollGroup": 1}},
+     EventClass.OTHER, EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_ACK),
+    ({"name": "AllReduce HCOLL Wait for Notice", "args": {"CollGroup": 1}},
+     EventClass.OTHER, EventClass.MAIU_HDMA_PROTOCOL_MONITOR_NOTICE),
+    ({"name": "AllReduce Host DMA DmaO", "args": {"CollGroup": 1}},
+     EventClass.DATA_OUT, EventClass.MAIU_HDMA_PROTOCOL_SEND_DATA),
+    ({"name": "AllReduce DmaI", "args": {"CollGroup": 1}},
+     EventClass.DATA_IN, EventClass.MAIU_P2PRDMA_PROTOCOL_RECV_DATA),
+    ({"name": "AllReduce Set BcList", "args": {"CollGroup": 1}},
+     EventClass.OTHER, EventClass.MAIU_PROTOCOL_SERIAL),
+    # not a collective: keep the incoming class
+    ({"name": "AllReduce Host DMA R5 Wait DATA", "args": {}},
+     EventClass.OTHER, EventClass.OTHER),
+]
+
+
+@pytest.mark.parametrize(
+    'flex_event_with_jobhash, in_class, out_class',
+    classify_comm_test_cases,
+    indirect=['flex_event_with_jobhash'])
+def test_classify_comm(flex_event_with_jobhash: TraceEvent, in_class, out_class, cat_ctx):
+    assert cat_ctx.classify_comm(flex_event_with_jobhash, in_class) == out_class
+
+
+host_dma_fragment_test_cases = [
+    ({"name": f"AllReduce Host DMA {fragment}", "args": {"CollGroup": 1}}, out_class)
+    for out_class, fragments in [
+        (EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA,
+         ["Wdone DmaI", "Wait for Data Avail Notice", "Wait for Notice (gather notifications)", "R5 Wait DATA"]),
+        (EventClass.MAIU_HDMA_PROTOCOL_WAIT_ACK, ["Wait for ACK", "R5 Wait ACK"]),
+        (EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_ACK, ["Send ACK Instruction", "R5 Send ACK"]),
+        (EventClass.MAIU_HDMA_PROTOCOL_SIGNAL_DATA, ["Send Instruction", "HCOLL Signal", "R5 Send DATA"]),
+        (EventClass.MAIU_HDMA_PROTOCOL_MONITOR_NOTICE, ["Wait for Notice", "Wait for Delivery Notice"]),
+    ]
+    for fragment in fragments
+]
+
+
+@pytest.mark.parametrize(
+    'flex_event_with_jobhash, out_class',
+    host_dma_fragment_test_cases,
+    indirect=['flex_event_with_jobhash'])
+def test_classify_comm_host_dma_fragments(flex_event_with_jobhash: TraceEvent, out_class, cat_ctx):
+    # every fragment of an or-group on its own selects the class of that group
+    assert cat_ctx.classify_comm(flex_event_with_jobhash, EventClass.OTHER) == out_class
+
+
+dlm_wait_test_cases = [
+    ({"name": "AllReduce DLM Wait", "args": {"CollGroup": 1}}, EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA),
+    ({"name": "AllReduce DLM Wait DmaI", "args": {"CollGroup": 1}}, EventClass.MAIU_HDMA_PROTOCOL_WAIT_DATA),
+    ({"name": "AllReduce DLM Wait", "args": {}}, EventClass.OTHER),
+]
+
+
+@pytest.mark.parametrize(
+    'flex_event_with_jobhash, out_class',
+    dlm_wait_test_cases,
+    indirect=['flex_event_with_jobhash'])
+def test_classify_dlm_wait(flex_event_with_jobhash: TraceEvent, out_class, cat_ctx):
+    # DLM Wait without a Host DMA prefix is a wait on data, in both classifiers
+    assert cat_ctx.classify_event(flex_event_with_jobhash) == out_class
+    assert cat_ctx.classify_flex(flex_event_with_jobhash) == out_class
+
+
+torch_classify_test_cases = [
+    ({"name": "aten::add", "cat": "kernel", "args": {}}, EventClass.COMPUTE_EXEC),
+    ({"name": "Memcpy (HtoD)", "cat": "gpu_memcpy", "args": {}}, EventClass.DATA_IN),
+    ({"name": "memcpy (DtoH)", "cat": "gpu_memcpy", "args": {}}, EventClass.DATA_OUT),
+    ({"name": "aiuDataConvert", "cat": "cuda_runtime", "args": {}}, EventClass.SEN_DATA_CONVERT),
+    ({"name": "aiuLaunchSuperNode", "cat": "cuda_runtime", "args": {}}, EventClass.ROUNDTRIP_FLEX),
+    ({"name": "aiuGraphExecution", "cat": "cuda_runtime", "args": {}}, EventClass.OTHER),
+]
+
+
+@pytest.mark.parametrize('event, out_class', torch_classify_test_cases)
+def test_classify_event_torch(event, out_class, cat_ctx, monkeypatch):
+    # keep the torch registration out of the process-wide jobmap
+    monkeypatch.setattr(GlobalIngestData, "_jobmap", dict(GlobalIngestData._jobmap))
+    jobhash = GlobalIngestData.add_job_info(source_uri="test_frame_torch.json", data_dialect=InputDialectTORCH())
+    event = TraceEvent(event, args={"jobhash": jobhash})
+    assert cat_ctx.classify_event(event) == out_class
+
+
+def test_get_event_class_cache(global_ingest_data, cat_ctx, monkeypatch):
+    monkeypatch.setattr(GlobalIngestData, "_jobmap", dict(GlobalIngestData._jobmap))
+    torch_jobhash = GlobalIngestData.add_job_info(source_uri="test_frame_torch.json", data_dialect=InputDialectTORCH())
+    events_and_classes = [
+        ({"name": "AllReduce DmaI", "args": {"CollGroup": 1, "jobhash": global_ingest_data}},
+         EventClass.MAIU_P2PRDMA_PROTOCOL_RECV_DATA),
+        ({"name": "AllReduce DmaI", "args": {"jobhash": global_ingest_data}}, EventClass.DATA_IN),
+        ({"name": "aten::add", "cat": "kernel", "args": {"jobhash": torch_jobhash}}, EventClass.COMPUTE_EXEC),
+        ({"name": "aten::add", "cat": "cpu_op", "args": {"jobhash": torch_jobhash}}, EventClass.OTHER),
+    ]
+    # repeated lookups of the same name must still respect the collective flag, cat, and dialect
+    for _ in range(2):
+        for event, event_class in events_and_classes:
+            assert cat_ctx.get_event_class(TraceEvent(event)) == event_class
+    assert len(cat_ctx._class_cache) == len(events_and_classes)
+
+
+flex_check_test_cases = [
+    ({"name": "add Cmpt Exec", "ph": "X", "ts": 10.0, "dur": 1.0, "args": {"class": "COMPUTE_EXEC"}}, False),
+    ({"name": "add Cmpt Exec", "ph": "X", "ts": 10.0, "dur": 1.0, "args": {"class": "OTHER"}}, True),
+]
+
+
+@pytest.mark.parametrize(
+    'flex_event_with_jobhash, mismatch',
+    flex_check_test_cases,
+    indirect=['flex_event_with_jobhash'])
+@pytest.mark.parametrize('flex_check', [True, False])
+def test_flex_check(flex_event_with_jobhash: TraceEvent, mismatch, flex_check):
+    ctx = EventCategorizerContext(flex_check=flex_check)
+    ctx.apply_stats(TraceEvent(flex_event_with_jobhash))
+    assert ctx.warnings["flex_mismatch"].has_warning() == (mismatch and flex_check)
+
+
+def test_flex_check_ignores_refined_class(global_ingest_data):
+    ctx = EventCategorizerContext(flex_check=True)
+    ctx.queues[global_ingest_data] = (10.0, 20.0)
+    event = TraceEvent({"name": "DmaI", "ph": "X", "ts": 15.0, "dur": 1.0,
+                        "args": {"TS1": "1", "class": "DATA_IN", "jobhash": global_ingest_data}})
+    ctx.apply_stats(event)
+    # the second pass turns the transfer into a protocol class, the FLEX classifier can't know that
+    assert event["args"]["class"] == "MAIU_PROTOCOL_RECV_DATA"
+    assert not ctx.warnings["flex_mismatch"].has_warning()
+
+
+second_pass_test_cases = [
+    # transfers inside the compute window of their batch are refined
+    ({"name": "DmaO", "ts": 15.0, "args": {"TS1": "1", "class": "DATA_OUT"}}, "MAIU_PROTOCOL_SEND_DATA"),
+    ({"name": "DmaO", "ts": 15.0, "args": {"TS1": "1", "bytes": 128, "class": "DATA_OUT"}},
+     "MAIU_PROTOCOL_SIGNAL_DATA"),
+    ({"name": "DmaI", "ts": 15.0, "args": {"TS1": "1", "class": "DATA_IN"}}, "MAIU_PROTOCOL_RECV_DATA"),
+    ({"name": "DmaI", "ts": 15.0, "args": {"TS1": "1", "bytes": 128, "class": "DATA_IN"}},
+     "MAIU_PROTOCOL_SIGNAL_ACK"),
+    # outside the window, not an acc event, or not a transfer: unchanged
+    ({"name": "DmaI", "ts": 25.0, "args": {"TS1": "1", "class": "DATA_IN"}}, "DATA_IN"),
+    ({"name": "DmaI", "ts": 15.0, "args": {"class": "DATA_IN"}}, "DATA_IN"),
+    ({"name": "Cmpt Exec", "ts": 15.0, "args": {"TS1": "1", "class": "COMPUTE_EXEC"}}, "COMPUTE_EXEC"),
+]
+
+
+@pytest.mark.parametrize(
+    'flex_event_with_jobhash, out_class',
+    second_pass_test_cases,
+    indirect=['flex_event_with_jobhash'])
+def test_second_pass_classify(flex_event_with_jobhash: TraceEvent, out_class, cat_ctx):
+    cat_ctx.queues[flex_event_with_jobhash["args"]["jobhash"]] = (10.0, 20.0)
+    assert cat_ctx.second_pass_classify(flex_event_with_jobhash) == out_class
+
+
+def test_collect_stats(global_ingest_data, cat_ctx):
+    for ts, rank, name in [(12.0, 0, "add Cmpt Exec"), (15.0, 0, "add Cmpt Exec"), (10.0, 1, "DmaI"),
+                           (11.0, 0, "add Cmpt Exec"), (9.0, 0, "DmaO"), (14.0, 1, "DmaO")]:
+        args = {"rank": rank, "jobhash": global_ingest_data}
+        cat_ctx.collect_stats(TraceEvent({"name": name, "ts": ts, "args": args}))
+
+    assert cat_ctx.first_ts_per_rank == {0: 9.0, 1: 10.0}
+    # only kernels span the compute window of the batch
+    assert cat_ctx.queues == {global_ingest_data: (11.0, 15.0)}
+
+
+def test_enhanced_events_bw_counters(cat_ctx):
+    event = TraceEvent({"ph": "X", "name": "DmaO", "ts": 10.0, "dur": 2.0, "pid": 3,
+                        "args": {"class": "DATA_OUT", "memory bandwidth (GB/s)": 1.5}})
+    result = cat_ctx.enhanced_events(event)
+    assert result[0] is event
+    assert result[1:] == [
+        {"ph": "C", "ts": 10.0, "pid": 3, "name": "TransferBW", "args": {"GB/s": 1.5}},
+        {"ph": "C", "ts": 12.0, "pid": 3, "name": "TransferBW", "args": {"GB/s": 0.0}},
+    ]
+    assert list(result[1].keys()) == ["ph", "ts", "pid", "name", "args"]
+    # counters must not share the template's args
+    assert result[1]["args"] is not result[2]["args"]
+
+    event["args"]["memory bandwidth (GB/s)"] = 0.0
+    assert cat_ctx.enhanced_events(event) == [event]
+
+
+@pytest.mark.parametrize('event_class', list(EventClass))
+def test_event_class_names(event_class):
+    assert str(event_class) == event_class.name
+    assert event_class.toJson() == event_class.name
+    assert EventClass.from_string(str(event_class)) is event_class
+    assert f"{event_class}" == event_class.name
@@ -0,0 +1,97 @@
+# Copyright 2024-2026 IBM Corporation
+
+import re
+
+import pytest
+
+from aiu_trace_analyzer.pipeline.flow_launch import LaunchFLowContext, launch_flow_create_missing
+
+
+launch_name_test_cases = [
+    "aiuLaunchControlBlocks",
+    "LaunchControlBlock",
+    "Launch ControlBlock",
+    "ControlBlock Launch",
+    "LaunchBlock",
+    "ControlBlockLaunchControl",
+    "LaunchControlBlock Launch",
+    "aiuScheduleWait",
+    "",
+]
+
+
+@pytest.mark.parametrize("name", launch_name_test_cases)
+def test_is_launch_event(name):
+    assert LaunchFLowContext.is_launch_event(name) == (re.search(r'Launch.*ControlBlock', name) is not None)
+
+
+def test_collect_launch_and_schedwait():
+    ctx = LaunchFLowContext()
+    launch = {"ph": "X", "name": "aiuLaunchControlBlocks", "ts": 1.0, "dur": 1.0, "pid": 0, "tid": 1,
+              "cat": "cuda_runtime", "args": {"correlation": 5}}
+    schedwait = {"ph": "X", "name": "aiuScheduleWait", "ts": 2.0, "dur": 10.0, "pid": 0, "tid": 1,
+                 "cat": "cuda_runtime", "args": {"correlation": 5}}
+    kernel = {"ph": "X", "name": "kernel", "ts": 3.0, "dur": 2.0, "pid": 1, "tid": 2,
+              "cat": "kernel", "args": {"correlation": 5}}
+    for event in [launch, schedwait, kernel]:
+        ctx.collect_launchflow_ids(event)
+
+    assert ctx.queues[5]["launch"] is launch
+    assert ctx.queues[5]["schedwait"] is schedwait
+    assert ctx.queues[5]["last_ts"] == pytest.approx(4.999)
+    assert ctx.queues[5]["last_pid_tid"] == (1, 2)
+    assert ctx.flow_id_seq == 5
+
+
+def test_create_missing_flows():
+    ctx = LaunchFLowContext()
+    src = {"ph": "s", "id": 7, "name": "launch", "cat": "ac2g", "ts": 1.0, "pid": 0, "tid": 1}
+    kernel = {"ph": "X", "name": "kernel", "ts": 3.0, "dur": 2.0, "pid": 1, "tid": 2,
+              "cat": "kernel", "args": {"correlation": 7}}
+    ctx.collect_launchflow_ids(src)
+    ctx.collect_launchflow_ids(kernel)
+    ctx.drain()
+
+    start, finish = ctx.create_missing(kernel)
+    assert (start["ph"], start["pid"], start["tid"], start["ts"]) == ("s", 0, 1, 1.0)
+    assert (finish["ph"], finish["pid"], finish["tid"], finish["ts"]) == ("f", 1, 2, 3.0)
+    assert start["id"] == finish["id"] == 8
+    assert finish["name"] == "launch" and finish["cat"] == "ac2g"
+
+    # no source flow for this correlation
+    assert ctx.create_missing(dict(kernel, args={"correlation": 9})) == []
+
+
+def test_launch_flow_create_missing():
+    ctx = LaunchFLowContext()
+    src = {"ph": "s", "id": 7, "name": "launch", "cat": "ac2g", "ts": 1.0, "pid": 0, "tid": 1}
+    kernel = {"ph": "X", "name": "kernel", "ts": 3.0, "dur": 2.0, "pid": 1, "tid": 2,
+              "cat": "kernel", "args": {"correlation": 7}}
+    other = {"ph": "X", "name": "other", "ts": 5.0, "dur": 1.0, "pid": 1, "tid": 2, "args": {}}
+    ctx.collect_launchflow_ids(src)
+    ctx.collect_launchflow_ids(kernel)
+    ctx.drain()
+
+    assert launch_flow_create_missing(other, ctx) == [other]
+    result = launch_flow_create_missing(kernel, ctx)
+    assert result[0] is kernel
+    assert [e["ph"] for e in result[1:]] == ["s", "f"]
+
+
+def test_drain_creates_schedwait_flows():
+    ctx = LaunchFLowContext()
+    src = {"ph": "s", "id": 5, "name": "launch", "cat": "ac2g", "ts": 1.0, "pid": 0, "tid": 1}
+    schedwait = {"ph": "X", "name": "aiuScheduleWait", "ts": 2.0, "dur": 10.0, "pid": 0, "tid": 3,
+                 "cat": "cuda_runtime", "args": {"correlation": 5}}
+    kernel = {"ph": "X", "name": "kernel", "ts": 3.0, "dur": 2.0, "pid": 1, "tid": 2,
+              "cat": "kernel", "args": {"correlation": 5}}
+    for event in [src, schedwait, kernel]:
+        ctx.collect_launchflow_ids(event)
+    ctx.drain()
+
+    start, finish = ctx.drain()
+    assert (start["ph"], start["pid"], start["tid"], start["ts"]) == ("s", 1, 2, ctx.queues[5]["last_ts"])
+    assert (finish["ph"], finish["pid"], finish["tid"], finish["ts"]) == ("f", 0, 3, 12.0)
+    assert start["id"] == finish["id"]
+    assert start["name"] == finish["name"] == "launch"
+    assert finish["bp"] == "e"
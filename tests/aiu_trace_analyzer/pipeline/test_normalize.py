@@ -3,10 +3,15 @@
 import pytest
 from sys import float_info
 
+import aiu_trace_analyzer.logger as aiulog
+from aiu_trace_analyzer.types import GlobalIngestData
+
 from aiu_trace_analyzer.pipeline.normalize import (
     _attr_to_args,
     _hex_to_int_str,
+    _name_unification,
     EventLimiter,
+    EventStats,
     NormalizationContext
 )
 
@@ -32,6 +37,24 @@ def test__attr_to_args(event, result):
     assert _attr_to_args(event) == result
 
 
+def test__attr_to_args_copies_containers():
+    attr = {'a': 1, 'l': [1, 2], 'd': {'x': 1}}
+    event = _attr_to_args({'ph': 'X', 'args': {'b': 2}, 'attr': attr})
+    assert event == {'ph': 'X', 'args': {'b': 2, 'a': 1, 'l': [1, 2], 'd': {'x': 1}}}
+    assert event['args']['l'] is not attr['l'] and event['args']['d'] is not attr['d']
+
+
+@pytest.mark.parametrize("name,result",
+                         [
+                             ('RDMA Receive', 'Rdma Recv'),
+                             ('ReceiveRDMA_RDMA', 'RecvRdma_Rdma'),
+                             ('Rdma Recv', 'Rdma Recv'),
+                             ('rdma receive', 'rdma receive'),
+                         ])
+def test__name_unification(name, result):
+    assert _name_unification(name) == result
+
+
 @pytest.fixture
 def normalization_ctx():
     return NormalizationContext(soc_frequency=1000.0,
@@ -86,6 +109,119 @@ def test_tsx_32bit_global_correction_ign(event, result, expect_warning, capsys):
         assert "OVC: local_correction fix has missed" in output.out
 
 
+def test_tsx_32bit_local_correction(normalization_ctx):
+    event = {'name': 'testevent DmaI', 'ph': 'X', 'ts': 3.141, 'dur': 1.0, 'pid': 0,
+             'args': {'TS1': '10', 'TS2': '20', 'TS3': '5', 'TS4': '7', 'TS5': '9', 'jobhash': 0}}
+    args = normalization_ctx.tsx_32bit_local_correction(event)
+    # everything after the wrap at TS3 is moved into the next 32bit epoch
+    assert [args[ts] for ts in ['TS1', 'TS2', 'TS3', 'TS4', 'TS5']] == \
+        ['10', '20', str(5 + (1 << 32)), str(7 + (1 << 32)), str(9 + (1 << 32))]
+    assert args['TSxOF'] == 'TS3'
+
+
+def test_event_stats_update():
+    stats = EventStats()
+    assert stats.freq_mean == 0.0
+    for cycles, freq in [((0, 10), 2.0), ((10, 20), 4.0), ((20, 30), 9.0)]:
+        stats.update(cycles, (float(cycles[0]), 1.0), freq)
+
+    assert (stats.freq_min, stats.freq_max, stats.freq_mean, stats.count) == (2.0, 9.0, 5.0, 3)
+    assert stats.freq_sum == 15.0
+    assert (stats.get_start_cycle(), stats.get_end_cycle(), stats.get_end_ts()) == (20, 30, 21.0)
+    assert not hasattr(stats, "__dict__")
+
+
+def test_freq_summary_averages_per_pid_means(normalization_ctx, monkeypatch, capsys):
+    monkeypatch.setattr(aiulog, "loglevel", aiulog.INFO)
+    for pid, freqs in [(0, [1000.0]), (1, [2000.0, 2000.0, 2000.0])]:
+        dur_stats = EventStats()
+        for freq in freqs:
+            dur_stats.update((0, 10), (0.0, 1.0), freq)
+        normalization_ctx.prev_event_data[pid] = {
+            NormalizationContext._DURATION_KEY: dur_stats,
+            NormalizationContext._INTERVAL_KEY: EventStats()}
+
+    normalization_ctx.__del__()
+    # mean of the per-pid means, not weighted by event count
+    assert "(min/mean/max): 1000.0 1500.0 2000.0" in capsys.readouterr().out
+
+
+def test_frequency_stats(normalization_ctx):
+    for ts, ts3, ts4 in [(1.0, '1000', '3000'), (11.0, '11000', '12000')]:
+        normalization_ctx.frequency_stats(
+            {'name': 'testevent Cmpt Exec', 'ph': 'X', 'ts': ts, 'dur': 2.0, 'pid': 0,
+             'args': {'TS3': ts3, 'TS4': ts4}})
+
+    stats = normalization_ctx.prev_event_data[normalization_ctx.queue_hash({'pid': 0})]
+    duration, interval = stats[NormalizationContext._DURATION_KEY], stats[NormalizationContext._INTERVAL_KEY]
+    assert (duration.freq_min, duration.freq_max, duration.count) == (500.0, 1000.0, 2)
+    # the first interval falls back to the duration-based frequency
+    assert (interval.freq_min, interval.freq_max) == (1000.0, 1000.0)
+    assert (interval.get_start_cycle(), interval.get_end_cycle()) == (11000, 12000)
+
+
+@pytest.mark.parametrize("loglevel,traced", [(aiulog.WARN, False), (aiulog.TRACE, True)])
+def test_frequency_stats_trace_log(normalization_ctx, monkeypatch, capsys, loglevel, traced):
+    monkeypatch.setattr(aiulog, "loglevel", loglevel)
+    normalization_ctx.frequency_stats(
+        {'name': 'testevent Cmpt Exec', 'ph': 'X', 'ts': 1.0, 'dur': 2.0, 'pid': 0,
+         'args': {'TS3': '1000', 'TS4': '3000'}})
+    assert ("|testevent Cmpt Exec" in capsys.readouterr().out) is traced
+
+
+def test_get_jobname(normalization_ctx, monkeypatch):
+    monkeypatch.setattr(GlobalIngestData, "_jobmap", dict(GlobalIngestData._jobmap))
+    jobhash = GlobalIngestData.add_job_info("/some/path/jobname_test.json")
+    assert normalization_ctx.get_jobname(jobhash) == "jobname_test.json"
+    assert normalization_ctx.get_jobname(jobhash) == "jobname_test.json"
+    assert normalization_ctx._jobnames == {jobhash: "jobname_test.json"}
+
+
+def test_queue_hash_per_pid(normalization_ctx):
+    qids = [normalization_ctx.queue_hash({'pid': pid}) for pid in [0, 1, -1, -2, 1000]]
+    assert len(set(qids)) == len(qids)
+
+
+event_filter_test_cases = [
+    ({'name': 'XYZ', 'args': {'Type': 'abc'}}, True),
+    ({'name': 'abc', 'args': {'Type': 'XYZ'}}, True),
+    ({'name': 'abc', 'args': {'Type': 'XYZ_'}}, False),
+    ({'name': 'abc', 'args': {}}, False),
+    ({'args': {'Type': 'abc'}}, False),
+]
+
+
+@pytest.mark.parametrize("event,filtered", event_filter_test_cases)
+def test_event_filtered(event, filtered):
+    ctx = NormalizationContext(soc_frequency=1000.0, filterstr="name:XYZ$,args.Type:^XYZ$,bad")
+    assert [path for path, _ in ctx.event_filter] == [('name',), ('args', 'Type')]
+    assert ctx.event_filtered(event) is filtered
+
+
+def test_event_filter_same_attribute():
+    ctx = NormalizationContext(soc_frequency=1000.0, filterstr="name:^A$,name:^B,args.Type:C")
+    assert [path for path, _ in ctx.event_filter] == [('name',), ('args', 'Type')]
+    assert ctx.event_filtered({'name': 'A', 'args': {}})
+    assert ctx.event_filtered({'name': 'Bx', 'args': {}})
+    assert not ctx.event_filtered({'name': 'xA', 'args': {}})
+
+    # patterns that can't be joined stay separate filters
+    ctx = NormalizationContext(soc_frequency=1000.0, filterstr="name:(?i)^a$,name:^B")
+    assert len(ctx.event_filter) == 2
+    assert ctx.event_filtered({'name': 'A', 'args': {}}) and ctx.event_filtered({'name': 'B', 'args': {}})
+
+    # groups and inline flags keep a pattern out of the alternation
+    ctx = NormalizationContext(soc_frequency=1000.0, filterstr="name:^C$,name:^D,name:(x)\\1$,name:(?i)^e$")
+    assert len(ctx.event_filter) == 3
+    assert ctx.event_filtered({'name': 'xx', 'args': {}}) and ctx.event_filtered({'name': 'E', 'args': {}})
+    assert ctx.event_filtered({'name': 'C', 'args': {}}) and ctx.event_filtered({'name': 'Dx', 'args': {}})
+    assert not ctx.event_filtered({'name': 'x', 'args': {}})
+
+    # a backreference must keep pointing at its own pattern's group
+    ctx = NormalizationContext(soc_frequency=1000.0, filterstr="name:(y)z,name:(x)\\1$")
+    assert ctx.event_filtered({'name': 'xx', 'args': {}})
+
+
 # ============================================================================
 # EventLimiter Tests
 # ============================================================================
@@ -0,0 +1,96 @@
+# Copyright 2024-2026 IBM Corporation
+
+from array import array
+
+import pytest
+
+from aiu_trace_analyzer.pipeline.power_stats import PowerStatisticsContext, analyze_power_statistics
+
+
+@pytest.fixture
+def power_stats_ctx():
+    return PowerStatisticsContext()
+
+
+def test_compute_weighted_stats(power_stats_ctx):
+    stats = power_stats_ctx._compute_weighted_stats([(1.0, 10.0), (2.0, 0.0), (3.0, 20.0), (4.0, 5.0)])
+    assert stats == pytest.approx({
+        'min_non_zero': 5.0,
+        'max': 20.0,
+        'mean_non_zero': 11.25,
+        'median_non_zero': 5.0,
+        'avg_total': 9.0,
+        'dur_total': 10.0,
+        'dur_non_zero': 8.0,
+    })
+
+
+def test_compute_weighted_stats_zero_power(power_stats_ctx):
+    stats = power_stats_ctx._compute_weighted_stats([(1.0, 0.0), (2.0, 0.0)])
+    assert stats == {
+        'min_non_zero': 0.0,
+        'max': 0.0,
+        'mean_non_zero': 0.0,
+        'median_non_zero': 0,
+        'avg_total': 0.0,
+        'dur_total': 3.0,
+        'dur_non_zero': 0.0,
+    }
+    assert power_stats_ctx._compute_weighted_stats([]) is None
+
+
+@pytest.mark.parametrize("starts,ends,merged", [
+    ([], [], []),
+    ([5.0], [6.0], [(5.0, 6.0)]),
+    # touching periods are merged, contained periods don't shorten the segment
+    ([0.0, 2.0, 1.0, 10.0], [2.0, 3.0, 1.5, 11.0], [(0.0, 3.0), (10.0, 11.0)]),
+    ([0.0, 1.0, 4.0], [10.0, 2.0, 5.0], [(0.0, 10.0)]),
+])
+def test_merge_periods(power_stats_ctx, starts, ends, merged):
+    assert power_stats_ctx._merge_periods(array('d', starts), array('d', ends)) == merged
+
+
+def test_split_power_period(power_stats_ctx):
+    kernel_timeline = power_stats_ctx._merge_periods([12.0, 0.0, 13.0, 18.0], [14.0, 2.0, 16.0, 30.0])
+    assert kernel_timeline == [(0.0, 2.0), (12.0, 16.0), (18.0, 30.0)]
+
+    # starting the scan at the first kernel that ends after the period start gives the same split
+    for first_kernel in [0, 1]:
+        with_kernels, without_kernels = [], []
+        power_stats_ctx._split_power_period(10.0, 20.0, 5.0, kernel_timeline,
+                                            with_kernels, without_kernels, first_kernel)
+        assert with_kernels == [(4.0, 5.0), (2.0, 5.0)]
+        assert without_kernels == [(2.0, 5.0), (2.0, 5.0)]
+
+    with_kernels, without_kernels = [], []
+    power_stats_ctx._split_power_period(3.0, 5.0, 5.0, kernel_timeline, with_kernels, without_kernels, 1)
+    assert (with_kernels, without_kernels) == ([], [(2.0, 5.0)])
+
+
+def test_analyze_power_statistics_collects(power_stats_ctx):
+    events = [
+        {"ph": "C", "name": "Power", "ts": 1.0, "pid": 0, "args": {"Watts": 10.0}},
+        {"ph": "X", "name": "x Cmpt Exec", "ts": 2.0, "dur": 3.0, "pid": 0, "tid": 0},
+        {"ph": "X", "name": "x DmaI", "ts": 2.0, "dur": 3.0, "pid": 0, "tid": 0},
+        {"ph": "C", "name": "TransferBW", "ts": 3.0, "pid": 0, "args": {"Watts": 99.0}},
+        {"ph": "C", "name": "Power", "ts": 4.0, "pid": 0, "args": {"Watts": 20.0}},
+        {"ph": "C", "name": "Power", "ts": 6.0, "pid": 0, "args": {"Watts": 30.0}},
+        {"ph": "M", "name": "process_name", "pid": 0, "args": {}},
+    ]
+    for event in events:
+        assert analyze_power_statistics(event, power_stats_ctx) == [event]
+
+    assert list(power_stats_ctx.power_starts) == [1.0, 4.0]
+    assert list(power_stats_ctx.power_ends) == [4.0, 6.0]
+    assert list(power_stats_ctx.power_values) == [10.0, 20.0]
+    assert (list(power_stats_ctx.kernel_starts), list(power_stats_ctx.kernel_ends)) == ([2.0], [5.0])
+
+
+def test_analyze_power_statistics_zero_ts(power_stats_ctx):
+    for event in [{"ph": "C", "name": "Power", "ts": 0.0, "pid": 0, "args": {"Watts": 10.0}},
+                  {"ph": "X", "name": "x Cmpt Exec", "ts": 0.0, "dur": 1.0, "pid": 0, "tid": 0},
+                  {"ph": "C", "name": "Power", "ts": 2.0, "pid": 0, "args": {"Watts": 20.0}}]:
+        analyze_power_statistics(event, power_stats_ctx)
+
+    assert (list(power_stats_ctx.power_starts), list(power_stats_ctx.power_ends)) == ([0.0], [2.0])
+    assert (list(power_stats_ctx.kernel_starts), list(power_stats_ctx.kernel_ends)) == ([0.0], [1.0])
@@ -5,6 +5,7 @@ import pandas as pd
 
 from aiu_trace_analyzer.pipeline.context import AbstractContext
 from aiu_trace_analyzer.pipeline.rcu_utilization import (
+    RCUTableFingerprint,
     RCUUtilizationContext,
     MultiRCUUtilizationContext,
     compute_utilization
@@ -100,6 +101,62 @@ def test_get_cycles(input: str, pid: int, expected: int, rcu: RCUUtilizationCont
     assert cycles == expected
 
 
+@pytest.mark.parametrize("input,pid,expected", list_of_cycles_tests)
+def test_get_ideal_time(input: str, pid: int, expected: int, rcu: RCUUtilizationContext):
+    fprint = next(iter(rcu.kernel_cycles))
+    assert rcu.get_ideal_time(input, fprint) == expected * rcu.cycle_to_clock_factor
+
+
+def test_get_ideal_time_without_table(rcu_without_table: RCUUtilizationContext):
+    assert rcu_without_table.get_ideal_time("bmm-BMM_1 Cmpt Exec", 0) == 0.0
+
+
+def test_accumulate_categories(rcu: RCUUtilizationContext):
+    fprint = next(iter(rcu.kernel_cat_map))
+    assert rcu.accumulate_categories(0, "bmm-BMM_1 Cmpt Exec", 2.0, 4.0, fprint) == "Bmm_fp16"
+    assert rcu.accumulate_categories(0, "addmm_MatMul-BMM_1 Cmpt Exec", 5.0, 3.0, fprint) == "Bmm_fp16"
+    assert rcu.accumulate_categories(0, "sub Cmpt Exec", 1.0, 1.0, fprint) == "Broadcast"
+
+    # ideal duration above the actual duration is not accumulated
+    cat_tab = rcu.categories[(fprint, 0)]
+    assert cat_tab["Bmm_fp16"] == [7.0, 2.0, 2]
+    assert cat_tab["Broadcast"] == [1.0, 1.0, 1]
+    assert cat_tab["Total"] == [8.0, 3.0, 3]
+    assert cat_tab["StcdpHbm"] == [0.0, 0.0, 0]
+
+
+def test_print_table_as_pd(rcu: RCUUtilizationContext):
+    fprint = next(iter(rcu.kernel_cat_map))
+    rcu.accumulate_categories(0, "bmm-BMM_1 Cmpt Exec", 2.0, 4.0, fprint)
+    rcu.accumulate_categories(0, "sub Cmpt Exec", 1.0, 1.0, fprint)
+    rcu.print_table_as_pd(rcu.categories)
+
+    df = pd.read_csv(rcu.csv_fname).set_index("Category")
+    assert list(df.index)[-1] == "Total"
+    assert df.loc["Bmm_fp16", "Frac_Time"] == 0.8
+    assert df.loc["Bmm_fp16", "Frac_Ideal"] == pytest.approx(0.6667)
+    assert df.loc["Bmm_fp16", "PT_Util"] == 0.5
+    assert df.loc["Bmm_fp16", "Ideal_Cyc"] == 1600
+    # categories without kernels get zero ratios instead of a division error
+    assert df.loc["StcdpHbm", ["Frac_Time", "Frac_Ideal", "PT_Util", "Calls"]].tolist() == [0.0, 0.0, 0.0, 0]
+
+
+def test_extract_tables_skips_non_data_lines(tmp_path):
+    logfile = tmp_path / "cycles.log"
+    logfile.write_text(
+        "kern_x-opCatBmm 100\n"    # data outside of a table section is ignored
+        " Ideal/Total Cycles \n"
+        "kern_a-opCatBmm 100\n"
+        "Precompute-opCatBmm 5\n"
+        "some other text 7\n"
+        "kern_b-NA 200 \n"
+        "====== Perf Summary End ======\n"
+        "kern_c-opCatBmm 300\n")
+    rcu = RCUUtilizationContext(compiler_info=str(logfile), soc_freq=1000, core_freq=800,
+                                csv_fname=f'{tmp_path}/test_output.json')
+    assert list(rcu.kernel_cycles.values()) == [{"kern_a Cmpt Exec": 100, "kern_b Cmpt Exec": 200}]
+
+
 def test_compute_utilization_assert():
     with pytest.raises(AssertionError):
         compute_utilization({"name": "Testevent", "ph": "X", "ts": 5.0}, AbstractContext())
@@ -111,6 +168,40 @@ def test_compute_utilization_event_passthrough(multircu_single):
     assert event[0] == {"name": "Testevent", "ph": "X", "ts": 5.0}
 
 
+kernel_name_test_cases = [
+    ({"name": "addmm_MatMul-BMM_1 Cmpt Exec", "pid": 0, "args": {}}, "addmm_MatMul-BMM_1 Cmpt Exec"),
+    ({"name": "addmm_MatMul-BMM_1", "pid": 0, "args": {}}, "addmm_MatMul-BMM_1 Cmpt Exec"),
+    ({"name": "addmm_[N] Cmpt Exec", "pid": 0, "args": {"fn_idx": 7}}, "addmm_7 Cmpt Exec"),
+    ({"name": "addmm_[N]_[N] Cmpt Exec", "pid": 0, "args": {"fn_idx": 7}}, "addmm_7_[N] Cmpt Exec"),
+    ({"name": "addmm_[N] Cmpt Exec", "pid": 0, "args": {}}, "addmm_[N] Cmpt Exec"),
+    ({"name": "addmm_[N] Cmpt Exec", "pid": 0}, "addmm_[N] Cmpt Exec"),
+]
+
+
+@pytest.mark.parametrize("event,kernel_name", kernel_name_test_cases)
+def test_extract_kernel_from_event_name(multircu_single, event, kernel_name):
+    assert multircu_single.extract_kernel_from_event_name(event) == kernel_name
+
+
+def _make_fprint(kernels: list[str], time: float) -> RCUTableFingerprint:
+    fprint = RCUTableFingerprint()
+    for k in kernels:
+        fprint.add(k, time / len(kernels))
+    return fprint
+
+
+@pytest.mark.parametrize("table_kernels,table_time,expected", [
+    (["a", "b", "c", "d"], 10.0, 1.25),    # job sequence contained in table
+    (["a", "c", "b", "d"], 10.0, 1.0),     # same kernels, sequence not contained
+    (["b"], 10.0, 0.0),                    # table shorter than job
+    (["a", "b", "c", "d"], 20.0, 0.0),     # table takes longer than job
+])
+def test_fingerprint_similarity(table_kernels, table_time, expected):
+    job = _make_fprint(["b", "c"], 10.0)
+    table = _make_fprint(table_kernels, table_time)
+    assert job.similarity(table) == pytest.approx(expected)
+
+
 tests_to_run_for_rcu_util: list[tuple[str, str, int, int]] = [
     (
         "--freq=560:800 -c tests/test_data/sample_comp_log_ideal.txt -i tests/test_data/sample_flex_3062_job_4.json",
@@ -0,0 +1,36 @@
+# Copyright 2024-2026 IBM Corporation
+
+from aiu_trace_analyzer.pipeline.sort import EventSortingContext, sort_events
+
+
+def test_drain_sorts_per_queue():
+    ctx = EventSortingContext(sortkey="ts,dur:r")
+    events = [
+        {"ph": "X", "name": "b", "ts": 2.0, "dur": 1.0, "pid": 0, "tid": 0},
+        {"ph": "X", "name": "c", "ts": 1.0, "dur": 1.0, "pid": 1, "tid": 0},
+        {"ph": "X", "name": "a", "ts": 1.0, "dur": 1.0, "pid": 0, "tid": 0},
+        {"ph": "X", "name": "a_long", "ts": 1.0, "dur": 5.0, "pid": 0, "tid": 0},
+        {"ph": "C", "name": "no_ts", "pid": 0},
+    ]
+    passed = [e for event in events for e in sort_events(event, ctx)]
+    assert [e["name"] for e in passed] == ["no_ts"]
+
+    drained = ctx.drain()
+    # queues in order of creation, each sorted by ts and then reverse dur
+    assert [e["name"] for e in drained] == ["a_long", "a", "b", "c"]
+    assert len(ctx.queues) == 0
+    assert ctx.drain() == []
+
+
+def test_drain_global_sort():
+    ctx = EventSortingContext(global_sort=True)
+    for pid, ts in [(0, 3.0), (1, 1.0), (2, 2.0)]:
+        sort_events({"ph": "X", "name": f"ev{pid}", "ts": ts, "dur": 1.0, "pid": pid, "tid": 0}, ctx)
+    assert [e["pid"] for e in ctx.drain()] == [1, 2, 0]
+
+
+def test_drain_single_reverse_key():
+    ctx = EventSortingContext(sortkey="ts:r")
+    for ts in [1.0, 3.0, "2.0"]:
+        sort_events({"ph": "X", "name": "ev", "ts": ts, "dur": 1.0, "pid": 0, "tid": 0}, ctx)
+    assert [e["ts"] for e in ctx.drain()] == [3.0, "2.0", 1.0]
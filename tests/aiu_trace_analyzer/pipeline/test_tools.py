@@ -2,7 +2,7 @@
 
 import pytest
 
-from aiu_trace_analyzer.pipeline.tools import PipelineContextTool
+from aiu_trace_analyzer.pipeline.tools import FlexEventMapToTS, PipelineContextTool
 
 
 @pytest.fixture
@@ -17,6 +17,9 @@ test_cases = [
     (
         "test_file", "extension", "test_file_extension.csv"
     ),
+    (
+        "test_file.pt.trace.json.gz", "summary", "test_file_summary.csv"
+    ),
     pytest.param("", None, None, marks=pytest.mark.xfail)
 ]
 
@@ -24,3 +27,59 @@ test_cases = [
 @pytest.mark.parametrize("fname_base, category, result", test_cases)
 def test_generate_filename(fname_base, category, result, tool_base):
     assert tool_base.generate_filename(fname_base, category) == result
+
+
+is_category_test_cases = [
+    # plain name compare
+    ({"name": "PrepareAndSyncRdma", "args": {}}, "acc_rdma_prep_sync", True),
+    ({"name": "PrepareAndSyncRdma 2", "args": {}}, "acc_rdma_prep_sync", False),
+    # is.<attr>;<regex>
+    ({"name": "add Cmpt Exec", "args": {}}, "acc_kernel", True),
+    ({"name": "add Cmpt Exec 2", "args": {}}, "acc_kernel", False),
+    ({"name": "Compute of node", "args": {}}, "acc_data_convert", True),
+    ({"name": "Compute of SenFusedDeviceNode", "args": {}}, "acc_data_convert", False),
+    # has.<attr>
+    ({"name": "AllReduce DmaI", "args": {"CollGroup": 1}}, "acc_collective", True),
+    ({"name": "AllReduce DmaI", "args": {}}, "acc_collective", False),
+]
+
+
+@pytest.mark.parametrize(
+    'flex_event_with_jobhash, category, result',
+    is_category_test_cases,
+    indirect=['flex_event_with_jobhash'])
+def test_is_category(flex_event_with_jobhash, category, result):
+    # the second call uses the compiled classifier
+    assert PipelineContextTool.is_category(flex_event_with_jobhash, category) == result
+    assert PipelineContextTool.is_category(flex_event_with_jobhash, category) == result
+
+
+@pytest.mark.parametrize(
+    'flex_event_with_jobhash, result',
+    [
+        ({"name": "add Cmpt Exec", "args": {"TS1": "0"}}, True),
+        ({"name": "add Cmpt Exec", "args": {}}, False),           # no acc event
+        ({"name": "add Cmpt Prep", "args": {"TS1": "0"}}, False),  # no kernel
+    ],
+    indirect=['flex_event_with_jobhash'])
+def test_is_acc_kernel_event(flex_event_with_jobhash, result):
+    assert PipelineContextTool.is_acc_kernel_event(flex_event_with_jobhash) == result
+    assert PipelineContextTool.is_acc_kernel_event(flex_event_with_jobhash) == (
+        PipelineContextTool.is_acc_event(flex_event_with_jobhash)
+        and PipelineContextTool.is_acc_kernel(flex_event_with_jobhash))
+
+
+def test_is_acc_kernel_event_without_dialect():
+    assert PipelineContextTool.is_acc_kernel_event({"name": "add Cmpt Exec", "args": {}}) is False
+
+
+def test_flex_event_map_to_ts():
+    ts_map = FlexEventMapToTS()
+    for _ in range(2):
+        assert ts_map["job0 DmaI"] == ("TS1", "TS2")
+        assert ts_map["job0 Cmpt Exec"] == ("TS3", "TS4")
+        assert ts_map["job0 Other"] is None
+
+    # adding an entry invalidates earlier lookups by name
+    ts_map.add("Other", ("TS1", "TS5"))
+    assert ts_map["job0 Other"] == ("TS1", "TS5")